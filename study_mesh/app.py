@@ -6,11 +6,12 @@ from datetime import datetime, timedelta
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database.db_manager import DatabaseManager
-from src.agents.orchestrator import create_orchestrator_agent
-from src.session_manager import SessionManager
+from src.session_manager import get_session_manager
 import asyncio
 from src.config import APP_TITLE, APP_ICON
+from database.days import day_number
+from database.db_manager import ACTIVE_DEADLINE_STATUSES
+from src.user_context import get_current_user_id, get_user_databases, get_user_db
 
 # Page configuration
 st.set_page_config(
@@ -20,15 +21,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize database and orchestrator
-@st.cache_resource
-def init_app():
-    db = DatabaseManager()
-    session_manager = SessionManager()
-    orchestrator = create_orchestrator_agent()
-    return db, session_manager, orchestrator
-
-db, session_manager, orchestrator = init_app()
+# Shared session manager (agents are built on their first call); the database is per user
+session_manager = get_session_manager()
+user_id = get_current_user_id()
+db = get_user_db()
 
 # Modern Custom CSS (Tailwind-inspired)
 st.markdown("""
@@ -167,6 +163,7 @@ st.markdown("""
 # Sidebar
 with st.sidebar:
     st.title(f"{APP_ICON} AI Planner")
+    st.caption(f"👤 {user_id}")
     st.markdown("---")
     
     # Check if user profile exists
@@ -189,15 +186,16 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("### 📊 Quick Stats")
     
-    # Get today's tasks
-    today_tasks = db.get_tasks(task_type="daily", status="pending")
-    completed_today = db.get_tasks(task_type="daily", status="completed")
+    # Get today's task counts
+    daily_counts = {row['status']: row['count'] for row in db.task_counts_by('status', task_type="daily")}
     
-    st.metric("Today's Tasks", len(today_tasks))
-    st.metric("Completed", len(completed_today))
+    st.metric("Today's Tasks", daily_counts.get('pending', 0))
+    st.metric("Completed", daily_counts.get('completed', 0))
+    # Marked by the status sweep, so this is the same indexed count
+    st.metric("Overdue", daily_counts.get('overdue', 0))
     
     # Get upcoming deadlines
-    deadlines = db.get_deadlines(status="pending")
+    deadlines = db.get_deadlines(status=ACTIVE_DEADLINE_STATUSES, columns=('id',), row_format='tuple')
     st.metric("Active Deadlines", len(deadlines))
     
     st.markdown("---")
@@ -252,10 +250,10 @@ else:
             # Get new streak count
             new_github_streak = db.get_streak_count('github')
             
-            # Generate praise using orchestrator
+            # Generate praise (routed to the content_creator agent)
             try:
                 praise_prompt = f"Generate a short (1 sentence), enthusiastic congratulations message for maintaining a {new_github_streak}-day GitHub coding streak. Be energetic and encouraging!"
-                praise_msg = session_manager.run_agent_sync(orchestrator, "user_default", praise_prompt)
+                praise_msg = session_manager.run_call("praise", user_id, praise_prompt)
                 
                 # Save praise
                 db.save_praise_message(praise_msg, context="github_streak")
@@ -264,7 +262,7 @@ else:
                 st.success(f"🎉 {praise_msg}")
                 st.balloons()
                 st.rerun()
-            except:
+            except Exception:
                 st.success(f"🎉 Awesome! {new_github_streak} day GitHub streak!")
     
     # Latest AI Praise
@@ -296,18 +294,24 @@ else:
                         checked = st.checkbox("", value=is_completed, key=f"task_{task['id']}")
                         
                         if checked and not is_completed:
-                            # Mark as completed
-                            db.update_task_status(task['id'], 'completed')
+                            # Status, progress and streak are durable before any model call
+                            db.complete_task(task['id'])
+                            
+                            # Praise is generated in the background and saved in its own write
+                            # once it arrives; it shows under Latest Encouragement on a later run.
+                            # The manager is looked up again at write time, since this page's one
+                            # may have been evicted from the open-database LRU by then.
+                            def save_praise(praise_msg, user_id=user_id, task_id=task['id']):
+                                if praise_msg:
+                                    get_user_databases().get(user_id).save_praise_message(praise_msg, task_id, "task_completion")
                             
-                            # Generate AI praise
                             try:
                                 praise_prompt = "Generate a short (10 words or less), energetic praise message for completing a task. Be enthusiastic!"
-                                praise_msg = session_manager.run_agent_sync(orchestrator, "user_default", praise_prompt)
-                                db.save_praise_message(praise_msg, task['id'], "task_completion")
-                                st.success(f"🎉 {praise_msg}")
-                            except:
-                                st.success("🎉 Great job!")
+                                session_manager.submit_call("praise", user_id, praise_prompt, on_result=save_praise)
+                            except Exception:
+                                pass
                             
+                            st.success("🎉 Great job!")
                             st.rerun()
                     
                     with col_text:
@@ -321,19 +325,20 @@ else:
     with col2:
         st.markdown('<div class="section-header">📅 Upcoming Deadlines</div>', unsafe_allow_html=True)
         
-        deadlines = db.get_deadlines(status="pending")
+        # Missed deadlines are swept out of the active statuses, so the first four are the nearest
+        deadlines = db.get_deadlines(status=ACTIVE_DEADLINE_STATUSES, limit=4)
         
         if deadlines:
-            for deadline in deadlines[:4]:
+            today = day_number(datetime.now())
+            for deadline in deadlines:
                 try:
-                    deadline_date = datetime.fromisoformat(deadline['deadline_date'])
-                    days_left = (deadline_date - datetime.now()).days
+                    days_left = deadline['deadline_day'] - today
                     
                     if days_left <= 7:
                         st.markdown(f'<div class="urgent-task">🔥 **{deadline["title"]}**<br>{days_left} days left!</div>', unsafe_allow_html=True)
                     else:
                         st.markdown(f'<div class="task-card">📌 **{deadline["title"]}**<br>{days_left} days left</div>', unsafe_allow_html=True)
-                except:
+                except Exception:
                     st.markdown(f'<div class="task-card">📌 **{deadline["title"]}**</div>', unsafe_allow_html=True)
         else:
             st.info("No active deadlines")
@@ -343,19 +348,14 @@ else:
         
         # Get weekly progress
         week_start = datetime.now().date() - timedelta(days=datetime.now().weekday())
-        progress = db.get_progress(start_date=week_start.isoformat())
-        
-        total_hours = sum([p['study_hours'] for p in progress if p.get('study_hours')])
+        total_hours = db.progress_totals(start_date=week_start.isoformat())['total_hours']
         st.metric("Study Hours", f"{total_hours:.1f}h")
         
-        # Tasks completed this week
-        completed_tasks = db.get_tasks(status="completed")
-        week_completed = [t for t in completed_tasks if t.get('completed_at', '').startswith(week_start.isoformat()[:7])]
-        st.metric("Tasks Completed", len(week_completed))
+        # Tasks completed this week: an index range on the integer completed_day
+        st.metric("Tasks Completed", db.count_tasks_completed_between(week_start, datetime.now().date()))
         
         # Papers read this week
-        papers = db.get_papers(is_read=1)
-        st.metric("Papers Read", len(papers))
+        st.metric("Papers Read", db.count_papers(is_read=1))
     
     st.markdown("---")
     
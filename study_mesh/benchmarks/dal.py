@@ -0,0 +1,465 @@
+"""Benchmark the data access layer on synthetic planners of different sizes.
+
+Run from the study_mesh folder::
+
+    python -m benchmarks.dal                          # 1k, 100k and 1M rows
+    python -m benchmarks.dal --scales 1k,100k --output before.json
+    python -m benchmarks.dal --scales 1k,100k --compare before.json
+
+Each scale is a planner with that many rows spread over tasks,
+progress_history, papers and user_streaks (plus a few deadlines). The
+generated databases are kept in --data-dir and reused; every run works on a
+fresh copy. Every public DatabaseManager and DatabaseMCP method is timed
+(p50/p95 over --repeat calls) and its peak Python memory is measured with
+tracemalloc on one extra call. Results are written as JSON; --compare prints
+the p50 change against an earlier file and exits with status 1 when any
+method got slower than --tolerance allows.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from database.db_manager import DatabaseManager
+from database.tracing import UNTRACED_METHODS
+from src.mcp.database_mcp import DatabaseMCP
+
+SCALES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+DEFAULT_SCALES = ('1k', '100k', '1m')
+DEFAULT_REPEAT = 30
+DEFAULT_TOLERANCE = 1.25
+
+# Calls faster than this are mostly timer noise, so --compare never flags them
+MIN_COMPARABLE_MS = 0.05
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Share of a scale's rows that goes to each table
+TABLE_SHARES = {'tasks': 0.40, 'progress_history': 0.40, 'papers': 0.15, 'user_streaks': 0.05}
+
+# Deadlines are not part of the scale; a planner has a handful
+DEADLINE_COUNT = 200
+REQUIREMENTS_PER_DEADLINE = 6
+
+# Progress sessions, completions and papers spread over this many past days
+HISTORY_DAYS = 730
+
+# Rows per bulk-writer call while generating
+GENERATE_BATCH = 20_000
+
+WORDS = (
+    "attention transformer graph neural network reinforcement learning diffusion model "
+    "benchmark dataset robustness retrieval language vision scaling optimisation kernel "
+    "gradient sparse federated causal inference contrastive embedding memory planning"
+).split()
+
+ACTIVITY_TYPES = ('general', 'github', 'study', 'task')
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _batches(rows, size=GENERATE_BATCH):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def generate_planner(db_path, rows, seed=0):
+    """Fill a new database with a synthetic planner of about `rows` rows; returns row counts."""
+    rng = random.Random(seed)
+    today = date.today()
+    counts = {table: int(rows * share) for table, share in TABLE_SHARES.items()}
+
+    db = DatabaseManager(db_path)
+    try:
+        db.save_user_profile("Bench Student", "Finish the thesis", 4, 6, "transformers, graphs")
+
+        tasks = [
+            {
+                'title': f"{_text(rng, 4)} #{i}",
+                'description': _text(rng, 12),
+                'task_type': rng.choice(('daily', 'daily', 'weekly', 'long-term')),
+                'priority': rng.randint(1, 5),
+                'estimated_hours': rng.choice((0.5, 1, 1.5, 2, 3)),
+                'due_date': (today - timedelta(days=rng.randint(-30, HISTORY_DAYS))).isoformat()
+            }
+            for i in range(counts['tasks'])
+        ]
+        for batch in _batches(tasks):
+            db.add_tasks_bulk(batch)
+
+        with db.get_connection() as conn:
+            # Seven in ten tasks are done, completed on a day within the history window
+            conn.execute(f"""
+                UPDATE tasks SET
+                    status = 'completed',
+                    completed_at = strftime('%Y-%m-%dT%H:%M:%S', 'now', '-' || (id * 7919 % {HISTORY_DAYS}) || ' days')
+                WHERE id % 10 < 7
+            """)
+
+        max_task = max(counts['tasks'], 1)
+        progress = [
+            {
+                'task_id': rng.randint(1, max_task),
+                'study_hours': rng.choice((0.5, 1, 1.5, 2)),
+                'notes': _text(rng, 6),
+                'date': (today - timedelta(days=rng.randrange(HISTORY_DAYS))).isoformat()
+            }
+            for _ in range(counts['progress_history'])
+        ]
+        for batch in _batches(progress):
+            db.add_progress_bulk(batch)
+
+        papers = [
+            {
+                'title': _text(rng, 8).capitalize(),
+                'authors': ", ".join(f"Author {rng.randint(1, 5000)}" for _ in range(3)),
+                'abstract': _text(rng, 60),
+                'arxiv_id': f"{2000 + i // 100000}.{i % 100000:05d}",
+                'pdf_url': f"https://arxiv.org/pdf/{i}",
+                'published_date': (today - timedelta(days=rng.randrange(HISTORY_DAYS))).isoformat(),
+                'summary': _text(rng, 20) if rng.random() < 0.3 else None
+            }
+            for i in range(counts['papers'])
+        ]
+        for batch in _batches(papers):
+            db.save_papers_bulk(batch)
+
+        with db.get_connection() as conn:
+            conn.execute("UPDATE papers SET is_read = 1 WHERE id % 3 = 0")
+            # One streak row per day (user_streaks.date is unique), most recent first
+            conn.executemany(
+                "INSERT INTO user_streaks (date, activity_type) VALUES (?, ?)",
+                [
+                    ((today - timedelta(days=day)).isoformat(), rng.choice(ACTIVITY_TYPES))
+                    for day in range(counts['user_streaks'])
+                ]
+            )
+        db.rebuild_streak_state()
+
+        db.add_deadlines_bulk([
+            {
+                'title': f"{_text(rng, 3)} deadline #{i}",
+                'description': _text(rng, 10),
+                'deadline_date': (today + timedelta(days=rng.randint(-60, 180))).isoformat(),
+                'category': rng.choice(("Scholarship", "Internship", "Fellowship", "Conference")),
+                'priority': rng.randint(1, 5),
+                'requirements': [_text(rng, 3) for _ in range(REQUIREMENTS_PER_DEADLINE)]
+            }
+            for i in range(DEADLINE_COUNT)
+        ])
+
+        with db.get_connection() as conn:
+            conn.execute("PRAGMA optimize")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        db.close()
+
+    counts['deadlines'] = DEADLINE_COUNT
+    return counts
+
+
+def planner_path(data_dir, scale, seed):
+    """Cached generated database for a scale, creating it on first use; returns (path, counts)."""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"planner-{scale}-seed{seed}.db")
+    counts_path = path + ".json"
+
+    if not (os.path.exists(path) and os.path.exists(counts_path)):
+        for stale in (path, path + "-wal", path + "-shm", counts_path):
+            if os.path.exists(stale):
+                os.remove(stale)
+        start = time.perf_counter()
+        counts = generate_planner(path, SCALES[scale], seed)
+        print(f"  generated {scale} planner in {time.perf_counter() - start:.1f}s")
+        with open(counts_path, "w") as f:
+            json.dump(counts, f)
+
+    with open(counts_path) as f:
+        return path, json.load(f)
+
+
+def _ids(db, query):
+    with db.get_connection() as conn:
+        return [row[0] for row in conn.execute(query)]
+
+
+def make_context(db, backup_dir):
+    """Ids and dates the benchmark cases draw their arguments from."""
+    today = date.today()
+    return SimpleNamespace(
+        db=db,
+        mcp=DatabaseMCP(db=db),
+        today=today,
+        month_ago=(today - timedelta(days=30)).isoformat(),
+        week_start=today - timedelta(days=today.weekday()),
+        backup_dir=backup_dir,
+        pending_task_ids=_ids(db, "SELECT id FROM tasks WHERE status = 'pending' ORDER BY id DESC LIMIT 5000"),
+        paper_ids=_ids(db, "SELECT id FROM papers ORDER BY id LIMIT 1000"),
+        deadline_ids=tuple(_ids(db, "SELECT id FROM deadlines ORDER BY deadline_date LIMIT 10")),
+        requirement_ids=_ids(db, "SELECT id FROM deadline_requirements ORDER BY id LIMIT 1000"),
+        reminder_ids=[],
+        counter=0
+    )
+
+
+def _next(ctx, pool):
+    """Cycle through an id pool so repeated calls touch different rows."""
+    ctx.counter += 1
+    return pool[ctx.counter % len(pool)] if pool else None
+
+
+def _pop(ctx, pool):
+    """Use each id once (for calls that consume their row)."""
+    return pool.pop() if pool else None
+
+
+def _add_reminder(ctx):
+    reminder_id = ctx.db.add_reminder('deadline', "Bench reminder", ctx.today.isoformat())
+    ctx.reminder_ids.append(reminder_id)
+    return reminder_id
+
+
+def _paper(ctx, i):
+    return {
+        'title': f"Bench paper {i}", 'authors': "A. Author", 'abstract': "Bench abstract " * 20,
+        'arxiv_id': f"bench.{ctx.counter}.{i}", 'pdf_url': "https://arxiv.org/pdf/bench",
+        'published_date': ctx.today.isoformat()
+    }
+
+
+# (owner, method, label, call, repeat). Reads come first, then writes, then
+# maintenance that reshapes the data (archiving, restore) so it runs last.
+# repeat=None uses --repeat.
+CASES = [
+    # Reads
+    ('db', 'get_user_profile', '', lambda c: c.db.get_user_profile(), None),
+    ('db', 'get_tasks', 'daily pending page', lambda c: c.db.get_tasks(task_type='daily', status='pending', limit=20), None),
+    ('db', 'get_tasks', 'completed page, tuples', lambda c: c.db.get_tasks(status='completed', limit=20, columns=('id', 'title'), row_format='tuple'), None),
+    ('db', 'tasks_completed_between', 'this week', lambda c: c.db.tasks_completed_between(c.week_start, c.today), None),
+    ('db', 'count_tasks_completed_between', 'last 30 days', lambda c: c.db.count_tasks_completed_between(c.month_ago, c.today), None),
+    ('db', 'task_counts_by', 'type x status', lambda c: c.db.task_counts_by('task_type', 'status'), None),
+    ('db', 'get_deadlines', 'active page', lambda c: c.db.get_deadlines(status=('pending', 'in_progress'), limit=10), None),
+    ('db', 'get_requirements', 'page of 10', lambda c: c.db.get_requirements(c.deadline_ids), None),
+    ('db', 'get_progress', 'last 30 days', lambda c: c.db.get_progress(start_date=c.month_ago), None),
+    ('db', 'get_daily_progress', 'last 30 days', lambda c: c.db.get_daily_progress(start_date=c.month_ago), None),
+    ('db', 'hours_by', 'week', lambda c: c.db.hours_by('week', start_date=c.month_ago), None),
+    ('db', 'progress_totals', 'last 30 days', lambda c: c.db.progress_totals(start_date=c.month_ago), None),
+    ('db', 'get_github_activity', '', lambda c: c.db.get_github_activity(start_date=c.month_ago), None),
+    ('db', 'get_papers', 'unread page', lambda c: c.db.get_papers(is_read=0, limit=20), None),
+    ('db', 'get_papers', 'library columns, objects', lambda c: c.db.get_papers(limit=20, columns=('id', 'title', 'authors'), row_format='object'), None),
+    ('db', 'get_paper_abstract', '', lambda c: c.db.get_paper_abstract(_next(c, c.paper_ids)), None),
+    ('db', 'count_papers', 'unread', lambda c: c.db.count_papers(is_read=0), None),
+    ('db', 'get_posts', '', lambda c: c.db.get_posts(limit=20), None),
+    ('db', 'get_active_reminders', '', lambda c: c.db.get_active_reminders(), None),
+    ('db', 'search', 'two words', lambda c: c.db.search("graph transformer"), None),
+    ('db', 'get_streak_state', '', lambda c: c.db.get_streak_state(), None),
+    ('db', 'get_streak_count', 'github', lambda c: c.db.get_streak_count('github'), None),
+    ('db', 'get_streaks_history', '30 days', lambda c: c.db.get_streaks_history(30), None),
+    ('db', 'get_latest_praise', '', lambda c: c.db.get_latest_praise(), None),
+    ('db', 'get_praise_history', '7 days', lambda c: c.db.get_praise_history(7), None),
+    ('db', 'list_backups', '', lambda c: c.db.list_backups(c.backup_dir), None),
+    ('mcp', 'query_progress_summary', '', lambda c: c.mcp.query_progress_summary(7), None),
+    ('mcp', 'query_task_statistics', '', lambda c: c.mcp.query_task_statistics(), None),
+    ('mcp', 'query_upcoming_deadlines', '', lambda c: c.mcp.query_upcoming_deadlines(30), None),
+    ('mcp', 'query_overdue', '', lambda c: c.mcp.query_overdue(), None),
+    ('mcp', 'query_github_consistency', '', lambda c: c.mcp.query_github_consistency(7), None),
+
+    # Writes
+    ('db', 'save_user_profile', '', lambda c: c.db.save_user_profile("Bench Student", "Finish the thesis", 4, 6, "graphs"), None),
+    ('db', 'add_task', '', lambda c: c.db.add_task("Bench task", "", 'daily', 3, 1.0, c.today.isoformat()), None),
+    ('db', 'add_tasks_bulk', '100 tasks', lambda c: c.db.add_tasks_bulk([{'title': f"Bulk {i}", 'task_type': 'daily'} for i in range(100)]), None),
+    ('db', 'update_task_status', '', lambda c: c.db.update_task_status(_next(c, c.pending_task_ids), 'in_progress'), None),
+    ('db', 'complete_task', '', lambda c: c.db.complete_task(_pop(c, c.pending_task_ids), hours=1), None),
+    ('db', 'delete_task', '', lambda c: c.db.delete_task(_pop(c, c.pending_task_ids)), None),
+    ('db', 'add_deadline', '5 requirements', lambda c: c.db.add_deadline("Bench deadline", "", (c.today + timedelta(days=30)).isoformat(), "Other", 3, ["a", "b", "c", "d", "e"]), None),
+    ('db', 'add_deadlines_bulk', '20 deadlines', lambda c: c.db.add_deadlines_bulk([{'title': f"Bulk {i}", 'deadline_date': c.today.isoformat(), 'requirements': "x\ny"} for i in range(20)]), None),
+    ('db', 'toggle_requirement', '', lambda c: c.db.toggle_requirement(_next(c, c.requirement_ids)), None),
+    ('db', 'update_deadline_status', '', lambda c: c.db.update_deadline_status(_next(c, list(c.deadline_ids)), 'in_progress'), None),
+    ('db', 'add_progress', '', lambda c: c.db.add_progress(None, 1.0, "Bench session", c.today.isoformat()), None),
+    ('db', 'add_progress_bulk', '100 sessions', lambda c: c.db.add_progress_bulk([{'study_hours': 0.5, 'date': c.today.isoformat()} for _ in range(100)]), None),
+    ('db', 'save_github_activity', '', lambda c: c.db.save_github_activity(c.today.isoformat(), 3, "bench/repo", "Bench commits"), None),
+    ('db', 'save_paper', '', lambda c: c.db.save_paper(**_paper(c, 0)), None),
+    ('db', 'save_papers_bulk', '50 papers', lambda c: c.db.save_papers_bulk([_paper(c, i) for i in range(50)]), None),
+    ('db', 'mark_paper_read', '', lambda c: c.db.mark_paper_read(_next(c, c.paper_ids)), None),
+    ('db', 'save_post', '', lambda c: c.db.save_post('linkedin', "Bench post", "Bench achievement"), None),
+    ('db', 'add_reminder', '', _add_reminder, None),
+    ('db', 'dismiss_reminder', '', lambda c: c.db.dismiss_reminder(_pop(c, c.reminder_ids)), None),
+    ('db', 'update_streak', 'today', lambda c: c.db.update_streak(c.today.isoformat(), 'study'), None),
+    ('db', 'save_praise_message', '', lambda c: c.db.save_praise_message("Great work!", None, "bench"), None),
+
+    # Maintenance
+    ('db', 'sweep_statuses', '', lambda c: c.db.sweep_statuses(), 3),
+    ('db', 'sweep_statuses_if_due', 'already swept', lambda c: c.db.sweep_statuses_if_due(), None),
+    ('db', 'rebuild_progress_daily', '', lambda c: c.db.rebuild_progress_daily(), 3),
+    ('db', 'rebuild_streak_state', '', lambda c: c.db.rebuild_streak_state(), 3),
+    ('db', 'backup', '', lambda c: c.db.backup(c.backup_dir), 3),
+    ('db', 'backup_if_due', 'not due', lambda c: c.db.backup_if_due(backup_dir=c.backup_dir), None),
+    ('db', 'archive_old_rows', '', lambda c: c.db.archive_old_rows(), 3),
+    ('db', 'compact', '', lambda c: c.db.compact(), 3),
+    ('db', 'compact_if_due', 'not due', lambda c: c.db.compact_if_due(), None),
+    ('db', 'restore', 'latest snapshot', lambda c: c.db.restore(c.db.list_backups(c.backup_dir)[0], c.backup_dir), 1),
+]
+
+
+def public_methods(cls, skip=frozenset()):
+    return {name for name in dir(cls) if not name.startswith('_') and name not in skip and callable(getattr(cls, name))}
+
+
+def uncovered_methods():
+    """Public DAL/MCP methods without a benchmark case (new methods must get one)."""
+    covered = {(owner, method) for owner, method, _, _, _ in CASES}
+    missing = [f"DatabaseManager.{name}" for name in public_methods(DatabaseManager, UNTRACED_METHODS) if ('db', name) not in covered]
+    missing += [f"DatabaseMCP.{name}" for name in public_methods(DatabaseMCP) if ('mcp', name) not in covered]
+    return sorted(missing)
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def time_case(ctx, call, repeat):
+    """p50/p95/mean/max wall time (ms) over `repeat` calls plus tracemalloc peak (KiB) of one more."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call(ctx)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        call(ctx)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'runs': repeat,
+        'p50_ms': round(_percentile(timings, 0.50), 4),
+        'p95_ms': round(_percentile(timings, 0.95), 4),
+        'mean_ms': round(statistics.fmean(timings), 4),
+        'max_ms': round(timings[-1], 4),
+        'peak_kib': round(peak / 1024, 1)
+    }
+
+
+def run_scale(scale, data_dir, repeat, cache_size, seed):
+    """Benchmark every case on a fresh copy of the scale's planner."""
+    base_path, counts = planner_path(data_dir, scale, seed)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_path = os.path.join(work_dir, "planner.db")
+        shutil.copyfile(base_path, db_path)
+        backup_dir = os.path.join(work_dir, "backups")
+
+        db = DatabaseManager(db_path, cache_size=cache_size)
+        try:
+            ctx = make_context(db, backup_dir)
+            methods = {}
+            for owner, method, label, call, case_repeat in CASES:
+                name = f"{'DatabaseManager' if owner == 'db' else 'DatabaseMCP'}.{method}"
+                if label:
+                    name += f" [{label}]"
+                methods[name] = time_case(ctx, call, case_repeat or repeat)
+                print(f"  {name:<70} p50 {methods[name]['p50_ms']:>10.3f} ms  p95 {methods[name]['p95_ms']:>10.3f} ms")
+        finally:
+            db.close()
+
+        return {
+            'rows': counts,
+            'db_size_mib': round(os.path.getsize(base_path) / 2**20, 1),
+            'methods': methods
+        }
+
+
+def compare(results, baseline, tolerance):
+    """Print the p50 ratio of every method found in both runs; returns the regressions."""
+    regressions = []
+    for scale, scale_results in results['scales'].items():
+        old_methods = baseline.get('scales', {}).get(scale, {}).get('methods', {})
+        for name, stats in scale_results['methods'].items():
+            old = old_methods.get(name)
+            if not old or not old['p50_ms']:
+                continue
+            ratio = stats['p50_ms'] / old['p50_ms']
+            slower = ratio > tolerance and stats['p50_ms'] >= MIN_COMPARABLE_MS
+            flag = "  REGRESSION" if slower else ""
+            print(f"{scale:>5} {name:<70} {old['p50_ms']:>10.3f} -> {stats['p50_ms']:>10.3f} ms ({ratio:.2f}x){flag}")
+            if flag:
+                regressions.append((scale, name, ratio))
+    return regressions
+
+
+def parse_scales(text):
+    scales = [scale.strip().lower() for scale in text.split(",") if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown scale(s) {unknown}; choose from {list(SCALES)}")
+    return scales
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseManager and DatabaseMCP at several data sizes.")
+    parser.add_argument("--scales", type=parse_scales, default=list(DEFAULT_SCALES),
+                        help=f"Comma-separated sizes from {list(SCALES)} (default: all)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed calls per method")
+    parser.add_argument("--cache-size", type=int, default=0, help="DatabaseManager read cache size (0 = off)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Where generated planners are kept between runs")
+    parser.add_argument("--output", help="Write results to this JSON file (default: benchmark-<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare p50 latencies against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="p50 slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    missing = uncovered_methods()
+    if missing:
+        print("No benchmark case for: " + ", ".join(missing))
+        return 2
+
+    results = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'cache_size': args.cache_size,
+            'seed': args.seed
+        },
+        'scales': {}
+    }
+
+    for scale in args.scales:
+        print(f"{scale}:")
+        results['scales'][scale] = run_scale(scale, args.data_dir, args.repeat, args.cache_size, args.seed)
+
+    output = args.output or f"benchmark-{datetime.now():%Y%m%d-%H%M%S}.json"
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} method(s) slower than {args.tolerance}x their baseline p50")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
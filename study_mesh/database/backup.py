@@ -0,0 +1,172 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+# Pages copied per backup step (~1 MB with 4 KiB pages) and the pause between
+# steps. The source is only read-locked during a step, so interactive writes
+# get in between steps instead of waiting for the whole copy.
+PAGES_PER_STEP = 256
+STEP_SLEEP = 0.005
+
+# Writes from other connections restart a stepped backup; after this many
+# restarts the copy finishes in one step from a single WAL read snapshot
+MAX_RESTARTS = 3
+
+# Snapshots kept per database by rotate_snapshots
+DEFAULT_KEEP = 7
+
+SNAPSHOT_TIME_FORMAT = "%Y%m%d-%H%M%S-%f"
+
+# Snapshots taken before a restore are named <stem>-pre-restore-<timestamp>.db;
+# rotation only matches untagged names, so it never deletes them
+PRE_RESTORE_TAG = "pre-restore"
+
+# One backup at a time per database file
+_backup_locks = {}
+_backup_locks_lock = threading.Lock()
+
+
+class _BackupRestarted(Exception):
+    """Raised from the progress callback to abandon a stepped backup that keeps restarting."""
+
+
+def backup_lock(db_path):
+    """Lock held while a snapshot of `db_path` is written or restored."""
+    key = os.path.abspath(db_path)
+    with _backup_locks_lock:
+        return _backup_locks.setdefault(key, threading.Lock())
+
+
+def default_backup_dir(db_path):
+    """Snapshots live in a backups/ folder next to the database."""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), "backups")
+
+
+def _snapshot_pattern(db_path, tag=None):
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    if tag:
+        stem = f"{stem}-{tag}"
+    return stem, re.compile(rf"^{re.escape(stem)}-(\d{{8}}-\d{{6}}-\d{{6}})\.db$")
+
+
+def list_snapshots(db_path, backup_dir=None, tag=None):
+    """Snapshot paths of a database, newest first; `tag` lists tagged ones (e.g. PRE_RESTORE_TAG) instead."""
+    backup_dir = backup_dir or default_backup_dir(db_path)
+    if not os.path.isdir(backup_dir):
+        return []
+
+    _, pattern = _snapshot_pattern(db_path, tag)
+    names = sorted(
+        (name for name in os.listdir(backup_dir) if pattern.match(name)),
+        key=lambda name: pattern.match(name).group(1),
+        reverse=True
+    )
+    return [os.path.join(backup_dir, name) for name in names]
+
+
+def snapshot_time(snapshot_path):
+    """When a snapshot was taken, parsed from its file name."""
+    stamp = re.search(r"-(\d{8}-\d{6}-\d{6})\.db$", snapshot_path).group(1)
+    return datetime.strptime(stamp, SNAPSHOT_TIME_FORMAT)
+
+
+def copy_database(source, destination, pages=PAGES_PER_STEP, sleep=STEP_SLEEP, max_restarts=MAX_RESTARTS):
+    """Copy one open connection's database into another with the online backup API.
+
+    Copies `pages` pages per step and sleeps between steps. If writers keep
+    restarting the copy, finishes with a single step instead, which in WAL
+    mode reads one consistent snapshot without blocking writers.
+    """
+    remaining_before = [None]
+    restarts = [0]
+
+    def progress(status, remaining, total):
+        if remaining_before[0] is not None and remaining > remaining_before[0]:
+            restarts[0] += 1
+            if restarts[0] > max_restarts:
+                raise _BackupRestarted()
+        remaining_before[0] = remaining
+
+    try:
+        source.backup(destination, pages=pages, progress=progress, sleep=sleep)
+    except _BackupRestarted:
+        source.backup(destination, pages=-1)
+
+
+def create_snapshot(db_path, backup_dir=None, keep=DEFAULT_KEEP, pages=PAGES_PER_STEP, sleep=STEP_SLEEP, tag=None):
+    """Write a consistent snapshot of a live database, then rotate old ones.
+
+    The copy goes to a .partial file that is checked and renamed into place,
+    so a crash never leaves a truncated snapshot behind. `keep=None` skips
+    rotation. A `tag` goes into the file name, which keeps the snapshot out
+    of the rotation (and is never rotated itself). Returns the snapshot path.
+    """
+    with backup_lock(db_path):
+        return write_snapshot(db_path, backup_dir, keep, pages, sleep, tag)
+
+
+def write_snapshot(db_path, backup_dir=None, keep=DEFAULT_KEEP, pages=PAGES_PER_STEP, sleep=STEP_SLEEP, tag=None):
+    """create_snapshot for a caller that already holds backup_lock(db_path)."""
+    backup_dir = backup_dir or default_backup_dir(db_path)
+    os.makedirs(backup_dir, exist_ok=True)
+    stem, _ = _snapshot_pattern(db_path, tag)
+
+    stamp = datetime.now().strftime(SNAPSHOT_TIME_FORMAT)
+    path = os.path.join(backup_dir, f"{stem}-{stamp}.db")
+    partial = path + ".partial"
+
+    source = sqlite3.connect(db_path, timeout=30)
+    destination = sqlite3.connect(partial)
+    try:
+        copy_database(source, destination, pages, sleep)
+        result = destination.execute("PRAGMA quick_check").fetchone()[0]
+        if result != "ok":
+            raise sqlite3.DatabaseError(f"Snapshot failed integrity check: {result}")
+    except BaseException:
+        destination.close()
+        os.remove(partial)
+        raise
+    finally:
+        source.close()
+    destination.close()
+
+    os.replace(partial, path)
+    if keep is not None and not tag:
+        rotate_snapshots(db_path, backup_dir, keep)
+    return path
+
+
+def rotate_snapshots(db_path, backup_dir=None, keep=DEFAULT_KEEP):
+    """Delete all but the `keep` newest snapshots; returns the removed paths."""
+    removed = list_snapshots(db_path, backup_dir)[keep:]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+
+def restore_snapshot(snapshot_path, destination):
+    """Overwrite the database behind an open connection with a snapshot.
+
+    Runs as a single backup step so readers never see a half-restored
+    database; the caller holds backup_lock, re-runs migrations and drops
+    cached reads.
+    """
+    if not os.path.exists(snapshot_path):
+        raise FileNotFoundError(snapshot_path)
+
+    source = sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)
+    try:
+        source.backup(destination, pages=-1)
+    finally:
+        source.close()
+
+
+def snapshot_is_due(db_path, interval_hours, backup_dir=None):
+    """True when the newest snapshot is older than `interval_hours` (or there is none)."""
+    snapshots = list_snapshots(db_path, backup_dir)
+    if not snapshots:
+        return True
+    age = datetime.now() - snapshot_time(snapshots[0])
+    return age.total_seconds() >= interval_hours * 3600
@@ -0,0 +1,153 @@
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from functools import wraps
+
+# Per-database write generation of every table, shared by all DatabaseManager
+# instances in the process (each Streamlit page builds its own manager).
+_table_generations = {}
+_generations_lock = threading.Lock()
+
+
+def table_generations(db_path):
+    """Generation counters for the tables of one database file."""
+    key = os.path.abspath(db_path)
+    with _generations_lock:
+        return _table_generations.setdefault(key, defaultdict(int))
+
+
+def bump_generations(generations, tables):
+    """Mark `tables` as written so cached reads of them go stale."""
+    with _generations_lock:
+        for table in tables:
+            generations[table] += 1
+
+
+_MUTABLE = (list, dict)
+
+
+def _copy_result(value):
+    """Copy cached results down to their nested lists and dicts, so callers can mutate what they get back.
+
+    Getters return lists of dict rows, dicts of lists (get_requirements) and
+    the like; scalars and the immutable tuple/object rows are shared as they are.
+    """
+    if isinstance(value, list):
+        return [_copy_result(item) if isinstance(item, _MUTABLE) else item for item in value]
+    if isinstance(value, dict):
+        copy = dict(value)
+        for key, item in copy.items():
+            if isinstance(item, _MUTABLE):
+                copy[key] = _copy_result(item)
+        return copy
+    return value
+
+
+class QueryCache:
+    """Size-bounded LRU of read results, invalidated by per-table write generations.
+
+    Writes made by other processes are not seen; the cache is meant for one
+    Streamlit server owning its database file.
+    """
+
+    def __init__(self, db_path, max_entries=256, metrics=None):
+        self.max_entries = max_entries
+        self.metrics = metrics
+        self.generations = table_generations(db_path)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def snapshot(self, tables):
+        """Current generations of `tables`, taken before running the query."""
+        return tuple(self.generations[table] for table in tables)
+
+    def get(self, key, tables):
+        """Return (True, value) for a fresh entry, else (False, None)."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == self.snapshot(tables):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                hit, value = True, entry[1]
+            else:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                hit, value = False, None
+
+        if self.metrics is not None:
+            self.metrics.increment_counter("db_cache_hits" if hit else "db_cache_misses")
+        return hit, _copy_result(value)
+
+    def put(self, key, snapshot, value):
+        """Store a result computed while the tables were at `snapshot`."""
+        with self.lock:
+            self.entries[key] = (snapshot, _copy_result(value))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+            }
+
+
+def cached_read(*tables):
+    """Serve a DatabaseManager getter from its QueryCache while `tables` are unchanged."""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self.cache
+            if cache is None or self.in_transaction():
+                # Inside a transaction the result may include uncommitted writes
+                return method(self, *args, **kwargs)
+
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                # e.g. a list passed as a cursor; just run the query
+                return method(self, *args, **kwargs)
+
+            hit, value = cache.get(key, tables)
+            if hit:
+                return value
+
+            snapshot = cache.snapshot(tables)
+            value = method(self, *args, **kwargs)
+            cache.put(key, snapshot, value)
+            return value
+        return wrapper
+    return decorator
+
+
+def invalidates(*tables):
+    """Bump the generation of `tables` after a DatabaseManager write method runs.
+
+    Inside a transaction the bump is deferred until it commits or rolls back,
+    so no reader can cache a pre-commit result under the new generation.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                if not self._defer_invalidation(tables):
+                    bump_generations(self.table_generations, tables)
+        return wrapper
+    return decorator
@@ -0,0 +1,121 @@
+import queue
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+# Pragmas applied once to every pooled connection.
+# WAL lets readers keep going while a writer commits, and NORMAL sync is
+# durable across application crashes in WAL mode while skipping most fsyncs.
+DEFAULT_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("mmap_size", 268435456),  # 256 MB
+    ("cache_size", -16000),  # ~16 MB (negative value is KiB)
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", 5000),
+)
+
+
+def _close_idle(idle):
+    """Close every connection still sitting in the idle queue."""
+    while True:
+        try:
+            conn = idle.get_nowait()
+        except queue.Empty:
+            return
+        conn.close()
+
+
+class ConnectionPool:
+    """Bounded pool of long-lived SQLite connections for one database file."""
+
+    def __init__(self, db_path, max_size=5, pragmas=DEFAULT_PRAGMAS, timeout=30, on_connect=None):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.pragmas = pragmas
+        self.timeout = timeout
+        # Called with every newly opened connection (e.g. to install a trace callback)
+        self.on_connect = on_connect
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+        # Make sure idle connections are closed on garbage collection or interpreter exit
+        self._finalizer = weakref.finalize(self, _close_idle, self._idle)
+
+    def _open(self):
+        """Open a new connection and apply the pool pragmas."""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas:
+            conn.execute(f"PRAGMA {name} = {value}")
+        if self.on_connect is not None:
+            self.on_connect(conn)
+        return conn
+
+    def acquire(self):
+        """Take a connection from the pool, opening one if below the size limit."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed")
+            can_open = self._opened < self.max_size
+            if can_open:
+                self._opened += 1
+
+        if can_open:
+            try:
+                return self._open()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"Timed out waiting for a database connection ({self.max_size} in use)"
+            )
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back anything left open."""
+        if conn.in_transaction:
+            conn.rollback()
+
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+            return
+
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commits on success, rolls back on error, always returns it."""
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def in_use(self):
+        """Number of connections currently borrowed."""
+        with self._lock:
+            return self._opened - self._idle.qsize()
+
+    def close(self):
+        """Close idle connections; borrowed ones are closed when released."""
+        with self._lock:
+            self._closed = True
+        _close_idle(self._idle)
@@ -0,0 +1,116 @@
+"""Check that the maintained rollups agree with a full rebuild after archiving.
+
+Run ``python -m database.consistency`` (from the study_mesh folder) to run
+randomized trials on fresh temporary databases. Each trial records study
+sessions and streak days, archives them with a random retention of 0-30
+days, keeps writing (back-filled dates land on both sides of the archive
+horizon, and some hot sessions are edited or deleted), then compares
+progress_daily and streak_state with what rebuild_progress_daily and
+rebuild_streak_state compute from both tiers. The command exits with status 1
+on any difference, so it can gate CI.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+
+from .db_manager import DatabaseManager
+
+ACTIVITY_TYPES = ('general', 'github', 'study', 'task')
+
+# Days of history a trial writes into; retention horizons fall inside it
+HISTORY_DAYS = 40
+MAX_RETENTION_DAYS = 30
+
+
+def _random_date(rng, today):
+    return (today - timedelta(days=rng.randrange(HISTORY_DAYS))).isoformat()
+
+
+def _write_batch(db, rng, today, sessions=40, streak_days=20):
+    """Random study sessions and streak days, plus edits and deletes of hot sessions."""
+    for _ in range(sessions):
+        db.add_progress(rng.choice((None, 1, 2, 3)), rng.choice((0.5, 1, 2)), "", _random_date(rng, today))
+    for _ in range(streak_days):
+        db.update_streak(_random_date(rng, today), rng.choice(ACTIVITY_TYPES))
+
+    with db.get_connection() as conn:
+        ids = [row['id'] for row in conn.execute("SELECT id FROM progress_history")]
+        for session_id in rng.sample(ids, min(len(ids), 5)):
+            conn.execute(
+                "UPDATE progress_history SET task_id = ?, date = ? WHERE id = ?",
+                (rng.choice((None, 1, 2, 3)), _random_date(rng, today), session_id)
+            )
+        for session_id in rng.sample(ids, min(len(ids), 5)):
+            conn.execute("DELETE FROM progress_history WHERE id = ?", (session_id,))
+
+
+def _snapshot(db, query):
+    with db.get_connection() as conn:
+        return {row[0]: tuple(row[1:]) for row in conn.execute(query)}
+
+
+def _differences(label, maintained, rebuilt):
+    return [
+        (label, key, maintained.get(key), rebuilt.get(key))
+        for key in sorted(set(maintained) | set(rebuilt))
+        if maintained.get(key) != rebuilt.get(key)
+    ]
+
+
+def rollup_differences(db):
+    """[(table, key, maintained row, rebuilt row)] where progress_daily or streak_state disagree with a rebuild."""
+    daily_query = "SELECT date, ROUND(total_hours, 6), session_count, task_count FROM progress_daily"
+    streak_query = "SELECT activity_type, current_streak, longest_streak, last_active_date FROM streak_state"
+
+    maintained_daily = _snapshot(db, daily_query)
+    maintained_streaks = _snapshot(db, streak_query)
+    db.rebuild_progress_daily()
+    db.rebuild_streak_state()
+
+    return (_differences('progress_daily', maintained_daily, _snapshot(db, daily_query))
+            + _differences('streak_state', maintained_streaks, _snapshot(db, streak_query)))
+
+
+def run_trial(db_path, rng, today):
+    """One write / archive / write round; returns its rollup differences."""
+    db = DatabaseManager(db_path)
+    try:
+        _write_batch(db, rng, today)
+        retention = rng.randint(0, MAX_RETENTION_DAYS)
+        db.archive_old_rows({'progress_history': retention, 'user_streaks': retention}, today)
+        _write_batch(db, rng, today)
+        return rollup_differences(db)
+    finally:
+        db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail if rollups drift from a rebuild after archiving.")
+    parser.add_argument("--trials", type=int, default=40, help="Randomized trials to run")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random writes")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    today = date.today()
+    failed = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for trial in range(args.trials):
+            differences = run_trial(os.path.join(tmp, f"trial{trial}.db"), rng, today)
+            if differences:
+                failed += 1
+                print(f"Trial {trial}:")
+                for table, key, maintained, rebuilt in differences:
+                    print(f"  {table} {key}: maintained {maintained}, rebuilt {rebuilt}")
+
+    if failed:
+        print(f"FAIL: {failed} of {args.trials} trials left rollups that differ from a rebuild")
+        return 1
+    print(f"OK: progress_daily and streak_state match a rebuild in {args.trials} trials")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+from datetime import date, datetime, timedelta
+
+# Day 0 of the *_day columns; the migrations compute them as
+# julianday(date(column)) - 2440587.5
+EPOCH = date(1970, 1, 1)
+
+
+def day_number(value):
+    """Days since 1970-01-01 for a date, datetime or ISO date/timestamp string."""
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    elif isinstance(value, datetime):
+        value = value.date()
+    return (value - EPOCH).days
+
+
+def from_day_number(day):
+    """The date a day number stands for."""
+    return EPOCH + timedelta(days=day)
+
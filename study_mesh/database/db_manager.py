@@ -1,32 +1,321 @@
 import sqlite3
 import os
-from datetime import datetime, timedelta
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import date as date_type, datetime, timedelta
+
+from .backup import (
+    DEFAULT_KEEP,
+    PRE_RESTORE_TAG,
+    backup_lock,
+    create_snapshot,
+    list_snapshots,
+    restore_snapshot,
+    snapshot_is_due,
+    write_snapshot
+)
+from .cache import QueryCache, bump_generations, cached_read, invalidates, table_generations
+from .connection_pool import ConnectionPool
+from .migrator import apply_migrations
+from .days import day_number
+from .rows import fetch_rows
+from .tracing import SLOW_QUERY_MS, QueryTracer, instrument
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "planner.db")
+DEFAULT_POOL_SIZE = 5
+
+# streak_state key that tracks activity of any type
+STREAK_ALL = 'all'
+
+# Keyset sort order of each paginated list: (column, descending).
+# The id tie-breaker makes every cursor position unique.
+SORT_KEYS = {
+    'tasks': (('priority', True), ('due_date', False), ('id', False)),
+    'deadlines': (('deadline_date', False), ('id', False)),
+    'papers': (('published_date', True), ('id', False)),
+    'social_posts': (('created_at', True), ('id', False)),
+}
+
+# Deadlines still being worked on; toggle_requirement moves pending <-> in_progress
+ACTIVE_DEADLINE_STATUSES = ('pending', 'in_progress')
+
+# Status sweeps: table -> (date column, open statuses, status once the date has passed)
+STATUS_SWEEPS = {
+    'tasks': ('due_date', ('pending', 'in_progress'), 'overdue'),
+    'deadlines': ('deadline_date', ACTIVE_DEADLINE_STATUSES, 'missed'),
+}
+
+# Full-text search sources: FTS table, source table, title column and bm25 column weights
+SEARCH_SOURCES = {
+    'papers': ('papers_fts', 'papers', 'title', (10.0, 2.0, 4.0, 1.0)),
+    'tasks': ('tasks_fts', 'tasks', 'title', (10.0, 2.0)),
+    'deadlines': ('deadlines_fts', 'deadlines', 'title', (10.0, 2.0, 1.0)),
+}
+
+# Archive tier: hot table -> (archive table, age column, extra condition, default retention days).
+# Rows older than the retention horizon move to the archive table; the
+# <table>_all views span both tiers.
+ARCHIVE_POLICIES = {
+    'tasks': ('tasks_archive', 'completed_at', "status = 'completed'", 30),
+    'progress_history': ('progress_history_archive', 'date', None, 180),
+    'praise_messages': ('praise_messages_archive', 'created_at', None, 30),
+    'user_streaks': ('user_streaks_archive', 'date', None, 365),
+}
+
+# compact_if_due runs compaction at most this often
+COMPACTION_INTERVAL_DAYS = 7
+
+# backup_if_due takes a snapshot at most this often
+BACKUP_INTERVAL_HOURS = 24
+
+# Columns task_counts_by may group on
+TASK_GROUP_FIELDS = ('task_type', 'status')
+
+# SQL bucket expressions for hours_by; weeks are keyed by their Monday
+PERIOD_EXPRESSIONS = {
+    'day': "date",
+    'week': "date(date, 'weekday 0', '-6 days')",
+    'month': "strftime('%Y-%m', date)",
+}
+
+def _keyset_predicate(keys, values):
+    """SQL condition (and params) for rows sorting strictly after `values` in `keys` order."""
+    (column, descending), rest = keys[0], keys[1:]
+    value = values[0]
+    
+    # SQLite sorts NULLs first ascending and last descending
+    if value is None:
+        after, after_params = ("0", []) if descending else (f"{column} IS NOT NULL", [])
+        same, same_params = f"{column} IS NULL", []
+    else:
+        if descending:
+            after = f"({column} < ? OR {column} IS NULL)"
+        else:
+            after = f"{column} > ?"
+        after_params = [value]
+        same, same_params = f"{column} = ?", [value]
+    
+    if not rest:
+        return after, after_params
+    
+    rest_clause, rest_params = _keyset_predicate(rest, values[1:])
+    return f"({after} OR ({same} AND {rest_clause}))", after_params + same_params + rest_params
+
+
+def _fts_query(text):
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix."""
+    terms = [term.replace('"', '') for term in text.split()]
+    terms = [f'"{term}"' for term in terms if term]
+    if not terms:
+        return None
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+_SCALARS = (str, int, float)
+
+
+def _requirement_items(requirements):
+    """Checklist items from a list or newline-separated text, stripped and without blanks.
+    
+    The list usually comes from model-parsed JSON, so numbers are kept as text
+    and nested objects, lists and nulls are skipped rather than failing.
+    """
+    if not requirements:
+        return []
+    if isinstance(requirements, str):
+        requirements = requirements.splitlines()
+    elif not isinstance(requirements, (list, tuple)):
+        requirements = [requirements]
+    items = (str(item).strip() for item in requirements
+             if isinstance(item, _SCALARS) and not isinstance(item, bool))
+    return [item for item in items if item]
+
+
+def _keyset_filter(keys, values):
+    """Keyset condition plus a plain range bound on the leading key so SQLite can seek.
+    
+    The descending bound skips NULLs, so the writers store 0 / '' instead of NULL
+    for the descending leading keys (priority, published_date).
+    """
+    clause, params = _keyset_predicate(keys, values)
+    (column, descending), value = keys[0], values[0]
+    
+    if value is not None:
+        clause = f"{column} {'<=' if descending else '>='} ? AND {clause}"
+        params = [value] + params
+    
+    return clause, params
+
 
 class DatabaseManager:
-    """Manages all database operations for the planner."""
+    """Manages all database operations for the planner.
     
-    def __init__(self):
-        self.db_path = DB_PATH
+    The list getters (get_tasks, get_deadlines, get_progress, get_papers,
+    get_posts) take `columns=` to select only some columns and `row_format=`
+    of 'dict' (default), 'tuple' or 'object' (immutable slotted rows that
+    still support row['col']). cursor_for needs dict or object rows.
+    
+    With `trace=True` every query method reports its latency, row count and
+    SQL to `metrics` (see database.tracing).
+    """
+    
+    def __init__(self, db_path=DB_PATH, pool_size=DEFAULT_POOL_SIZE, cache_size=0, metrics=None,
+                 trace=False, slow_query_ms=SLOW_QUERY_MS):
+        self.db_path = db_path
+        if trace and metrics is None:
+            raise ValueError("trace=True needs a metrics collector to report to")
+        # Opt-in per-call timing and SQL capture, reported to `metrics`
+        self.tracer = QueryTracer(metrics, slow_query_ms) if trace else None
+        self.pool = ConnectionPool(
+            self.db_path, max_size=pool_size, on_connect=self.tracer.attach if self.tracer else None
+        )
+        # Read-through cache is opt-in; writes always bump the shared table generations
+        self.table_generations = table_generations(self.db_path)
+        self.cache = QueryCache(self.db_path, cache_size, metrics) if cache_size else None
+        # Connection and deferred invalidations of the transaction open on each thread
+        self._local = threading.local()
+        # Column names per table, read once to validate `columns=` projections
+        self._table_columns = {}
         self.init_database()
+        if self.tracer:
+            instrument(self, self.tracer)
     
     def init_database(self):
-        """Initialize database with schema if it doesn't exist."""
-        schema_path = os.path.join(os.path.dirname(__file__), "schema.sql")
-        
-        with sqlite3.connect(self.db_path) as conn:
-            with open(schema_path, 'r') as f:
-                conn.executescript(f.read())
-            conn.commit()
+        """Apply pending schema migrations (only a version check once up to date)."""
+        with self.get_connection() as conn:
+            self.schema_version = apply_migrations(conn)
     
     def get_connection(self):
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Borrow a pooled connection (commits on exit and returns it to the pool).
+        
+        Inside transaction() this is the transaction's connection, left open until it ends.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return nullcontext(conn)
+        return self.pool.connection()
+    
+    @contextmanager
+    def transaction(self):
+        """Run several DatabaseManager calls on one connection with a single commit.
+        
+            with db.transaction() as tx:
+                tx.update_task_status(task_id, 'completed')
+                tx.add_progress(task_id, 1.5, "", today)
+        
+        Takes the write lock up front (BEGIN IMMEDIATE), rolls everything back if
+        the block raises, and joins the outer transaction when nested.
+        """
+        if self.in_transaction():
+            yield self
+            return
+        
+        pending_tables = set()
+        try:
+            with self.pool.connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._local.conn = conn
+                self._local.pending_tables = pending_tables
+                try:
+                    yield self
+                finally:
+                    self._local.conn = None
+                    self._local.pending_tables = None
+        finally:
+            bump_generations(self.table_generations, pending_tables)
+    
+    def in_transaction(self):
+        """True while this thread is inside transaction()."""
+        return getattr(self._local, 'conn', None) is not None
+    
+    def _defer_invalidation(self, tables):
+        """Hold cache invalidations until the open transaction ends; False when there is none."""
+        pending_tables = getattr(self._local, 'pending_tables', None)
+        if pending_tables is None:
+            return False
+        pending_tables.update(tables)
+        return True
+    
+    def _begin(self, conn):
+        """Take the write lock unless the connection is already in a transaction."""
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+    
+    def close(self):
+        """Close all pooled connections."""
+        self.pool.close()
+    
+    def cache_stats(self):
+        """Read cache hit/miss counters (None when caching is off)."""
+        return self.cache.stats() if self.cache else None
+    
+    def _paginate(self, query, params, table, limit=None, after=None):
+        """Append the keyset cursor filter, ORDER BY and LIMIT for a list query."""
+        keys = SORT_KEYS[table]
+        
+        if after is not None:
+            clause, clause_params = _keyset_filter(keys, tuple(after))
+            query += f" AND {clause}"
+            params.extend(clause_params)
+        
+        query += " ORDER BY " + ", ".join(f"{column} {'DESC' if desc else 'ASC'}" for column, desc in keys)
+        
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        return query
+    
+    def _projection(self, table, columns=None):
+        """SELECT list for a getter's `columns=` argument, checked against the table's columns."""
+        if columns is None:
+            return "*"
+        
+        known = self._columns_of(table)
+        unknown = [column for column in columns if column not in known]
+        if unknown or not columns:
+            raise ValueError(f"Cannot select {unknown or 'no columns'} from {table}")
+        return ", ".join(columns)
+    
+    def _columns_of(self, table, generated=True):
+        """Column names of a table or view, in order (read once per manager).
+        
+        `generated=False` leaves out generated columns such as the *_day
+        numbers, which cannot be inserted into.
+        """
+        key = (table, generated)
+        columns = self._table_columns.get(key)
+        if columns is None:
+            with self.get_connection() as conn:
+                # table_xinfo's hidden flag: 0 normal, 2/3 generated (1 is a virtual-table hidden column)
+                allowed = (0, 2, 3) if generated else (0,)
+                columns = tuple(
+                    row['name'] for row in conn.execute(f"PRAGMA table_xinfo({table})")
+                    if row['hidden'] in allowed
+                )
+            self._table_columns[key] = columns
+        return columns
+    
+    def cursor_for(self, table, row):
+        """Cursor to pass as `after=` to fetch the rows following `row` in a paginated list."""
+        return tuple(row[column] for column, _ in SORT_KEYS[table])
+    
+    def _insert_many(self, query, rows):
+        """Insert rows with executemany in one transaction and return their new ids."""
+        if not rows:
+            return []
+        
+        with self.get_connection() as conn:
+            # Hold the write lock for the whole batch so AUTOINCREMENT ids stay contiguous
+            self._begin(conn)
+            conn.executemany(query, rows)
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        
+        return list(range(last_id - len(rows) + 1, last_id + 1))
     
     # User Profile
+    @cached_read('user_profile')
     def get_user_profile(self):
         """Get user profile."""
         with self.get_connection() as conn:
@@ -34,6 +323,7 @@ class DatabaseManager:
             row = cursor.fetchone()
             return dict(row) if row else None
     
+    @invalidates('user_profile')
     def save_user_profile(self, name, study_goal, hours_per_day, days_per_week, topics):
         """Save or update user profile."""
         with self.get_connection() as conn:
@@ -41,22 +331,37 @@ class DatabaseManager:
                 INSERT INTO user_profile (name, study_goal, hours_per_day, days_per_week, topics)
                 VALUES (?, ?, ?, ?, ?)
             """, (name, study_goal, hours_per_day, days_per_week, topics))
-            conn.commit()
     
     # Tasks
+    @invalidates('tasks')
     def add_task(self, title, description, task_type, priority=0, estimated_hours=None, due_date=None):
         """Add a new task."""
         with self.get_connection() as conn:
             cursor = conn.execute("""
                 INSERT INTO tasks (title, description, task_type, priority, estimated_hours, due_date)
                 VALUES (?, ?, ?, ?, ?, ?)
-            """, (title, description, task_type, priority, estimated_hours, due_date))
-            conn.commit()
+            """, (title, description, task_type, priority or 0, estimated_hours, due_date))
             return cursor.lastrowid
     
-    def get_tasks(self, task_type=None, status=None):
-        """Get tasks filtered by type and/or status."""
-        query = "SELECT * FROM tasks WHERE 1=1"
+    @invalidates('tasks')
+    def add_tasks_bulk(self, tasks):
+        """Add many tasks (dicts with add_task's arguments) in one transaction; returns their ids."""
+        rows = [
+            (t['title'], t.get('description'), t['task_type'], t.get('priority') or 0,
+             t.get('estimated_hours'), t.get('due_date'))
+            for t in tasks
+        ]
+        return self._insert_many("""
+            INSERT INTO tasks (title, description, task_type, priority, estimated_hours, due_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+    
+    @cached_read('tasks')
+    def get_tasks(self, task_type=None, status=None, limit=None, after=None, columns=None, row_format='dict',
+                  include_archived=False):
+        """Get tasks filtered by type and/or status, optionally one keyset page at a time."""
+        source = 'tasks_all' if include_archived else 'tasks'
+        query = f"SELECT {self._projection(source, columns)} FROM {source} WHERE 1=1"
         params = []
         
         if task_type:
@@ -66,12 +371,47 @@ class DatabaseManager:
             query += " AND status = ?"
             params.append(status)
         
-        query += " ORDER BY priority DESC, due_date ASC"
+        query = self._paginate(query, params, 'tasks', limit, after)
         
         with self.get_connection() as conn:
-            cursor = conn.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return fetch_rows(conn, query, params, row_format)
+    
+    @cached_read('tasks')
+    def tasks_completed_between(self, start_date, end_date, task_type=None, columns=None, row_format='dict',
+                                include_archived=False):
+        """Tasks completed from start_date through end_date, oldest completion first.
+        
+        Dates may be date objects or ISO strings; the range is a scan of the
+        integer completed_day index rather than a parse of every completed_at.
+        """
+        source = 'tasks_all' if include_archived else 'tasks'
+        query = f"SELECT {self._projection(source, columns)} FROM {source} WHERE completed_day BETWEEN ? AND ?"
+        params = [day_number(start_date), day_number(end_date)]
+        
+        if task_type:
+            query += " AND task_type = ?"
+            params.append(task_type)
+        
+        query += " ORDER BY completed_day, id"
+        
+        with self.get_connection() as conn:
+            return fetch_rows(conn, query, params, row_format)
+    
+    @cached_read('tasks')
+    def count_tasks_completed_between(self, start_date, end_date, task_type=None, include_archived=False):
+        """Number of tasks completed from start_date through end_date (answered from the index alone)."""
+        source = 'tasks_all' if include_archived else 'tasks'
+        query = f"SELECT COUNT(*) FROM {source} WHERE completed_day BETWEEN ? AND ?"
+        params = [day_number(start_date), day_number(end_date)]
+        
+        if task_type:
+            query += " AND task_type = ?"
+            params.append(task_type)
+        
+        with self.get_connection() as conn:
+            return conn.execute(query, params).fetchone()[0]
     
+    @invalidates('tasks')
     def update_task_status(self, task_id, status):
         """Update task status."""
         completed_at = datetime.now().isoformat() if status == 'completed' else None
@@ -80,62 +420,194 @@ class DatabaseManager:
                 UPDATE tasks SET status = ?, completed_at = ?
                 WHERE id = ?
             """, (status, completed_at, task_id))
-            conn.commit()
     
+    @invalidates('tasks')
     def delete_task(self, task_id):
         """Delete a task."""
         with self.get_connection() as conn:
             conn.execute("DELETE FROM tasks WHERE id = ?",(task_id,))
-            conn.commit()
+    
+    @invalidates('tasks', 'progress_history', 'progress_daily', 'user_streaks', 'streak_state')
+    def complete_task(self, task_id, hours=None, date=None, notes=None, activity_type='general'):
+        """Mark a task completed, log its study hours and count the day towards the streak.
+        
+        Runs as one transaction (joining the caller's, if any); hours default to the
+        task's estimate. Returns the new progress entry id, or None for an unknown task.
+        """
+        if date is None:
+            date = datetime.now().date().isoformat()
+        
+        with self.transaction():
+            with self.get_connection() as conn:
+                task = conn.execute(
+                    "SELECT title, estimated_hours FROM tasks WHERE id = ?", (task_id,)
+                ).fetchone()
+            if task is None:
+                return None
+        
+            self.update_task_status(task_id, 'completed')
+            progress_id = self.add_progress(
+                task_id=task_id,
+                study_hours=hours if hours is not None else task['estimated_hours'] or 0,
+                notes=notes or f"Completed: {task['title']}",
+                date=date
+            )
+            self.update_streak(date, activity_type, keep_existing=True)
+            return progress_id
     
     # Deadlines
+    @invalidates('deadlines', 'deadline_requirements')
     def add_deadline(self, title, description, deadline_date, category, priority=0, requirements=None):
-        """Add a new deadline."""
+        """Add a new deadline.
+        
+        `requirements` is a list of checklist items or newline-separated text;
+        each item becomes a deadline_requirements row.
+        """
+        items = _requirement_items(requirements)
         with self.get_connection() as conn:
+            self._begin(conn)
             cursor = conn.execute("""
                 INSERT INTO deadlines (title, description, deadline_date, category, priority, requirements)
                 VALUES (?, ?, ?, ?, ?, ?)
-            """, (title, description, deadline_date, category, priority, requirements))
-            conn.commit()
+            """, (title, description, deadline_date, category, priority, '\n'.join(items) or None))
+            self._insert_requirements(conn, [(cursor.lastrowid, items)])
             return cursor.lastrowid
     
-    def get_deadlines(self, status=None):
-        """Get deadlines."""
-        query = "SELECT * FROM deadlines WHERE 1=1"
+    @invalidates('deadlines', 'deadline_requirements')
+    def add_deadlines_bulk(self, deadlines):
+        """Add many deadlines (dicts with add_deadline's arguments) in one transaction; returns their ids."""
+        items = [_requirement_items(d.get('requirements')) for d in deadlines]
+        rows = [
+            (d['title'], d.get('description'), d['deadline_date'], d.get('category'),
+             d.get('priority', 0), '\n'.join(requirements) or None)
+            for d, requirements in zip(deadlines, items)
+        ]
+        with self.transaction():
+            ids = self._insert_many("""
+                INSERT INTO deadlines (title, description, deadline_date, category, priority, requirements)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            with self.get_connection() as conn:
+                self._insert_requirements(conn, zip(ids, items))
+        return ids
+    
+    def _insert_requirements(self, conn, deadline_items):
+        """Insert the checklist rows for (deadline_id, [item, ...]) pairs."""
+        conn.executemany("""
+            INSERT INTO deadline_requirements (deadline_id, text, position)
+            VALUES (?, ?, ?)
+        """, [
+            (deadline_id, text, position)
+            for deadline_id, items in deadline_items
+            for position, text in enumerate(items, start=1)
+        ])
+    
+    @cached_read('deadlines')
+    def get_deadlines(self, status=None, limit=None, after=None, columns=None, row_format='dict', due_by=None):
+        """Get deadlines, optionally one keyset page at a time.
+        
+        `status` may be one status or a tuple of them; `due_by` keeps deadlines
+        on or before that date. Rows carry requirements_total and
+        requirements_done for checklist progress.
+        """
+        query = f"SELECT {self._projection('deadlines', columns)} FROM deadlines WHERE 1=1"
         params = []
         
-        if status:
+        if isinstance(status, str):
             query += " AND status = ?"
             params.append(status)
+        elif status:
+            query += f" AND status IN ({', '.join('?' * len(status))})"
+            params.extend(status)
+        
+        if due_by:
+            query += " AND deadline_date <= ?"
+            params.append(due_by)
         
-        query += " ORDER BY deadline_date ASC"
+        query = self._paginate(query, params, 'deadlines', limit, after)
         
         with self.get_connection() as conn:
-            cursor = conn.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return fetch_rows(conn, query, params, row_format)
     
-    def update_deadline_status(self, deadline_id, status, completed_requirements=None):
-        """Update deadline status."""
+    @cached_read('deadline_requirements')
+    def get_requirements(self, deadline_ids):
+        """Checklists of several deadlines in one query: {deadline_id: [requirement, ...]}.
+        
+        Pass a tuple so the result can be cached. Every requested id is in the
+        result, with an empty list when the deadline has no requirements.
+        """
+        deadline_ids = tuple(deadline_ids)
+        requirements = {deadline_id: [] for deadline_id in deadline_ids}
+        if not deadline_ids:
+            return requirements
+        
+        with self.get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT id, deadline_id, text, done, position FROM deadline_requirements
+                WHERE deadline_id IN ({', '.join('?' * len(deadline_ids))})
+                ORDER BY deadline_id, position
+            """, deadline_ids).fetchall()
+        
+        for row in rows:
+            requirements[row['deadline_id']].append(dict(row))
+        return requirements
+    
+    @invalidates('deadlines', 'deadline_requirements')
+    def toggle_requirement(self, requirement_id, done=None):
+        """Tick or untick one requirement (flips it when `done` is None); returns the new state.
+        
+        A pending deadline moves to in_progress once anything is ticked and
+        back to pending when nothing is. Returns None for an unknown requirement.
+        """
         with self.get_connection() as conn:
+            self._begin(conn)
+            row = conn.execute(
+                "SELECT deadline_id, done FROM deadline_requirements WHERE id = ?", (requirement_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            done = not row['done'] if done is None else bool(done)
+            conn.execute("UPDATE deadline_requirements SET done = ? WHERE id = ?", (int(done), requirement_id))
+            # requirements_done was just updated by the deadline_requirements_update trigger
             conn.execute("""
-                UPDATE deadlines SET status = ?, completed_requirements = ?
-                WHERE id = ?
-            """, (status, completed_requirements, deadline_id))
-            conn.commit()
+                UPDATE deadlines
+                SET status = CASE WHEN requirements_done > 0 THEN 'in_progress' ELSE 'pending' END
+                WHERE id = ? AND status IN ('pending', 'in_progress')
+            """, (row['deadline_id'],))
+            return done
+    
+    @invalidates('deadlines')
+    def update_deadline_status(self, deadline_id, status):
+        """Update deadline status."""
+        with self.get_connection() as conn:
+            conn.execute("UPDATE deadlines SET status = ? WHERE id = ?", (status, deadline_id))
     
     # Progress History
+    @invalidates('progress_history', 'progress_daily')
     def add_progress(self, task_id, study_hours, notes, date):
         """Add progress entry."""
         with self.get_connection() as conn:
-            conn.execute("""
+            cursor = conn.execute("""
                 INSERT INTO progress_history (task_id, study_hours, notes, date)
                 VALUES (?, ?, ?, ?)
             """, (task_id, study_hours, notes, date))
-            conn.commit()
+            return cursor.lastrowid
+    
+    @invalidates('progress_history', 'progress_daily')
+    def add_progress_bulk(self, entries):
+        """Add many progress entries (dicts with add_progress's arguments) in one transaction; returns their ids."""
+        rows = [(e.get('task_id'), e.get('study_hours'), e.get('notes'), e['date']) for e in entries]
+        return self._insert_many("""
+            INSERT INTO progress_history (task_id, study_hours, notes, date)
+            VALUES (?, ?, ?, ?)
+        """, rows)
     
-    def get_progress(self, start_date=None, end_date=None):
+    @cached_read('progress_history')
+    def get_progress(self, start_date=None, end_date=None, columns=None, row_format='dict', include_archived=False):
         """Get progress history."""
-        query = "SELECT * FROM progress_history WHERE 1=1"
+        source = 'progress_history_all' if include_archived else 'progress_history'
+        query = f"SELECT {self._projection(source, columns)} FROM {source} WHERE 1=1"
         params = []
         
         if start_date:
@@ -147,11 +619,118 @@ class DatabaseManager:
         
         query += " ORDER BY date DESC"
         
+        with self.get_connection() as conn:
+            return fetch_rows(conn, query, params, row_format)
+    
+    # Analytics
+    @cached_read('tasks')
+    def task_counts_by(self, *fields, task_type=None, status=None, include_archived=False):
+        """Count tasks grouped by any of task_type/status, e.g. task_counts_by('task_type', 'status')."""
+        for field in fields:
+            if field not in TASK_GROUP_FIELDS:
+                raise ValueError(f"Cannot group tasks by {field!r}; expected one of {TASK_GROUP_FIELDS}")
+        
+        source = 'tasks_all' if include_archived else 'tasks'
+        query = f"SELECT {', '.join(fields + ('COUNT(*) AS count',))} FROM {source} WHERE 1=1"
+        params = []
+        
+        if task_type:
+            query += " AND task_type = ?"
+            params.append(task_type)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        
+        if fields:
+            query += f" GROUP BY {', '.join(fields)}"
+        
+        with self.get_connection() as conn:
+            cursor = conn.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @cached_read('progress_daily')
+    def get_daily_progress(self, start_date=None, end_date=None):
+        """Get the progress_daily rollup rows (date, total_hours, session_count, task_count), oldest first."""
+        query = "SELECT date, total_hours, session_count, task_count FROM progress_daily WHERE 1=1"
+        params = []
+        
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+        
+        query += " ORDER BY date ASC"
+        
+        with self.get_connection() as conn:
+            cursor = conn.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @cached_read('progress_daily')
+    def hours_by(self, period='day', start_date=None, end_date=None):
+        """Sum study hours per day, week (keyed by its Monday) or month, oldest first."""
+        if period not in PERIOD_EXPRESSIONS:
+            raise ValueError(f"Unknown period {period!r}; expected one of {tuple(PERIOD_EXPRESSIONS)}")
+        
+        query = f"""
+            SELECT {PERIOD_EXPRESSIONS[period]} AS period,
+                   SUM(total_hours) AS hours,
+                   SUM(session_count) AS sessions
+            FROM progress_daily WHERE 1=1
+        """
+        params = []
+        
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+        
+        query += " GROUP BY period ORDER BY period ASC"
+        
         with self.get_connection() as conn:
             cursor = conn.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
     
+    @cached_read('progress_daily')
+    def progress_totals(self, start_date=None, end_date=None):
+        """Get total study hours, session count and active days for a date range."""
+        query = """
+            SELECT IFNULL(SUM(total_hours), 0) AS total_hours,
+                   IFNULL(SUM(session_count), 0) AS sessions,
+                   COUNT(*) AS active_days
+            FROM progress_daily WHERE 1=1
+        """
+        params = []
+        
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+        
+        with self.get_connection() as conn:
+            return dict(conn.execute(query, params).fetchone())
+    
+    @invalidates('progress_daily')
+    def rebuild_progress_daily(self):
+        """Recompute the progress_daily rollup from both progress tiers; returns the day count."""
+        with self.get_connection() as conn:
+            self._begin(conn)
+            conn.execute("DELETE FROM progress_daily")
+            cursor = conn.execute("""
+                INSERT INTO progress_daily (date, total_hours, session_count, task_count)
+                SELECT date, SUM(IFNULL(study_hours, 0)), COUNT(*), COUNT(DISTINCT task_id)
+                FROM progress_history_all
+                GROUP BY date
+            """)
+            return cursor.rowcount
+    
     # GitHub Activity
+    @invalidates('github_activity')
     def save_github_activity(self, date, commits, repositories, activity_summary):
         """Save GitHub activity for a date."""
         with self.get_connection() as conn:
@@ -159,8 +738,8 @@ class DatabaseManager:
                 INSERT OR REPLACE INTO github_activity (date, commits, repositories, activity_summary)
                 VALUES (?, ?, ?, ?)
             """, (date, commits, repositories, activity_summary))
-            conn.commit()
     
+    @cached_read('github_activity')
     def get_github_activity(self, start_date=None, end_date=None):
         """Get GitHub activity."""
         query = "SELECT * FROM github_activity WHERE 1=1"
@@ -180,6 +759,7 @@ class DatabaseManager:
             return [dict(row) for row in cursor.fetchall()]
     
     # Papers
+    @invalidates('papers')
     def save_paper(self, title, authors, abstract, arxiv_id, pdf_url, published_date, summary=None):
         """Save a research paper."""
         with self.get_connection() as conn:
@@ -187,36 +767,100 @@ class DatabaseManager:
                 conn.execute("""
                     INSERT INTO papers (title, authors, abstract, arxiv_id, pdf_url, published_date, summary)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (title, authors, abstract, arxiv_id, pdf_url, published_date, summary))
-                conn.commit()
+                """, (title, authors, abstract, arxiv_id, pdf_url, published_date or '', summary))
             except sqlite3.IntegrityError:
                 pass  # Paper already exists
     
-    def get_papers(self, is_read=None, limit=None):
-        """Get papers."""
-        query = "SELECT * FROM papers WHERE 1=1"
+    @invalidates('papers')
+    def save_papers_bulk(self, papers):
+        """Save many papers (dicts with save_paper's arguments) in one transaction.
+        
+        Papers already in the library are left untouched. Returns the id of each
+        paper in input order, whether it was inserted now or already existed.
+        """
+        if not papers:
+            return []
+        
+        rows = [
+            (p['title'], p.get('authors'), p.get('abstract'), p.get('arxiv_id'),
+             p.get('pdf_url'), p.get('published_date') or '', p.get('summary'))
+            for p in papers
+        ]
+        insert_query = """
+            INSERT INTO papers (title, authors, abstract, arxiv_id, pdf_url, published_date, summary)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        
+        with self.get_connection() as conn:
+            self._begin(conn)
+            conn.executemany(
+                insert_query + " ON CONFLICT(arxiv_id) DO NOTHING",
+                [row for row in rows if row[3]]
+            )
+            
+            arxiv_ids = list({row[3] for row in rows if row[3]})
+            id_by_arxiv = {}
+            for start in range(0, len(arxiv_ids), 500):
+                chunk = arxiv_ids[start:start + 500]
+                cursor = conn.execute(
+                    f"SELECT id, arxiv_id FROM papers WHERE arxiv_id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                id_by_arxiv.update({row['arxiv_id']: row['id'] for row in cursor})
+            
+            # Papers without an arXiv id cannot be matched back, so insert those one by one
+            ids = []
+            for row in rows:
+                if row[3]:
+                    ids.append(id_by_arxiv.get(row[3]))
+                else:
+                    ids.append(conn.execute(insert_query, row).lastrowid)
+        
+        return ids
+    
+    @cached_read('papers')
+    def get_papers(self, is_read=None, limit=None, after=None, columns=None, row_format='dict'):
+        """Get papers, optionally one keyset page at a time."""
+        query = f"SELECT {self._projection('papers', columns)} FROM papers WHERE 1=1"
         params = []
         
         if is_read is not None:
             query += " AND is_read = ?"
             params.append(is_read)
         
-        query += " ORDER BY published_date DESC"
+        query = self._paginate(query, params, 'papers', limit, after)
         
-        if limit:
-            query += f" LIMIT {limit}"
+        with self.get_connection() as conn:
+            return fetch_rows(conn, query, params, row_format)
+    
+    @cached_read('papers')
+    def get_paper_abstract(self, paper_id):
+        """Get one paper's abstract, for list views that select columns without it."""
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT abstract FROM papers WHERE id = ?", (paper_id,)).fetchone()
+            return row['abstract'] if row else None
+    
+    @cached_read('papers')
+    def count_papers(self, is_read=None):
+        """Count saved papers."""
+        query = "SELECT COUNT(*) FROM papers WHERE 1=1"
+        params = []
+        
+        if is_read is not None:
+            query += " AND is_read = ?"
+            params.append(is_read)
         
         with self.get_connection() as conn:
-            cursor = conn.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return conn.execute(query, params).fetchone()[0]
     
+    @invalidates('papers')
     def mark_paper_read(self, paper_id):
         """Mark paper as read."""
         with self.get_connection() as conn:
             conn.execute("UPDATE papers SET is_read = 1 WHERE id = ?", (paper_id,))
-            conn.commit()
     
     # Social Posts
+    @invalidates('social_posts')
     def save_post(self, platform, content, achievement):
         """Save a social media post draft."""
         with self.get_connection() as conn:
@@ -224,25 +868,25 @@ class DatabaseManager:
                 INSERT INTO social_posts (platform, content, achievement)
                 VALUES (?, ?, ?)
             """, (platform, content, achievement))
-            conn.commit()
             return cursor.lastrowid
     
-    def get_posts(self, is_posted=None):
-        """Get social media posts."""
-        query = "SELECT * FROM social_posts WHERE 1=1"
+    @cached_read('social_posts')
+    def get_posts(self, is_posted=None, limit=None, after=None, columns=None, row_format='dict'):
+        """Get social media posts, optionally one keyset page at a time."""
+        query = f"SELECT {self._projection('social_posts', columns)} FROM social_posts WHERE 1=1"
         params = []
         
         if is_posted is not None:
             query += " AND is_posted = ?"
             params.append(is_posted)
         
-        query += " ORDER BY created_at DESC"
+        query = self._paginate(query, params, 'social_posts', limit, after)
         
         with self.get_connection() as conn:
-            cursor = conn.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return fetch_rows(conn, query, params, row_format)
     
     # Reminders
+    @invalidates('reminders')
     def add_reminder(self, reminder_type, message, target_date=None):
         """Add a reminder."""
         with self.get_connection() as conn:
@@ -250,8 +894,8 @@ class DatabaseManager:
                 INSERT INTO reminders (reminder_type, message, target_date)
                 VALUES (?, ?, ?)
             """, (reminder_type, message, target_date))
-            conn.commit()
     
+    @cached_read('reminders')
     def get_active_reminders(self):
         """Get active reminders."""
         with self.get_connection() as conn:
@@ -262,77 +906,192 @@ class DatabaseManager:
             """)
             return [dict(row) for row in cursor.fetchall()]
     
+    @invalidates('reminders')
     def dismiss_reminder(self, reminder_id):
         """Dismiss a reminder."""
         with self.get_connection() as conn:
             conn.execute("UPDATE reminders SET is_dismissed = 1 WHERE id = ?", (reminder_id,))
-            conn.commit()
+    
+    # Search
+    @cached_read('papers', 'tasks', 'deadlines')
+    def search(self, query, kinds=('papers', 'tasks', 'deadlines'), limit=20):
+        """Full-text search, best BM25 matches first, each with a highlighted snippet."""
+        match = _fts_query(query)
+        if not match:
+            return []
+        
+        selects = []
+        params = []
+        for kind in kinds:
+            if kind not in SEARCH_SOURCES:
+                raise ValueError(f"Cannot search {kind!r}; expected one of {tuple(SEARCH_SOURCES)}")
+            fts_table, table, title_column, weights = SEARCH_SOURCES[kind]
+            selects.append(f"""
+                SELECT '{kind}' AS kind, src.id AS id, src.{title_column} AS title,
+                       snippet({fts_table}, -1, '**', '**', '…', 16) AS snippet,
+                       bm25({fts_table}, {', '.join(map(str, weights))}) AS rank
+                FROM {fts_table} JOIN {table} AS src ON src.id = {fts_table}.rowid
+                WHERE {fts_table} MATCH ?
+            """)
+            params.append(match)
+        
+        if not selects:
+            return []
+        
+        sql = " UNION ALL ".join(selects) + " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        
+        with self.get_connection() as conn:
+            cursor = conn.execute(sql, params)
+            return [dict(row) for row in cursor.fetchall()]
     
     # User Streaks (NEW)
-    def update_streak(self, date=None, activity_type='general'):
-        """Update daily streak tracking."""
+    @invalidates('user_streaks', 'streak_state')
+    def update_streak(self, date=None, activity_type='general', keep_existing=False):
+        """Update daily streak tracking and the maintained streak state.
+        
+        With keep_existing, a day already recorded under another activity type keeps it.
+        """
         if date is None:
             date = datetime.now().date().isoformat()
         
         with self.get_connection() as conn:
-            try:
+            self._begin(conn)
+            # The day may already be recorded in either tier (archived days still count)
+            row = conn.execute(
+                "SELECT activity_type FROM user_streaks_all WHERE date = ?", (date,)
+            ).fetchone()
+            
+            if row is None:
                 conn.execute("""
                     INSERT INTO user_streaks (date, activity_type)
                     VALUES (?, ?)
                 """, (date, activity_type))
-                conn.commit()
-            except sqlite3.IntegrityError:
-                # Date already exists, update activity type if different
-                conn.execute("""
-                    UPDATE user_streaks SET activity_type = ?
-                    WHERE date = ?
-                """, (activity_type, date))
-                conn.commit()
+                self._advance_streak(conn, STREAK_ALL, date)
+                self._advance_streak(conn, activity_type, date)
+            elif row['activity_type'] != activity_type and not keep_existing:
+                # Date already exists, update activity type if different (in
+                # whichever tier holds it). The day moves between per-type
+                # streaks, so recompute both.
+                for table in ('user_streaks', 'user_streaks_archive'):
+                    conn.execute(f"""
+                        UPDATE {table} SET activity_type = ?
+                        WHERE date = ?
+                    """, (activity_type, date))
+                self._rebuild_streak(conn, row['activity_type'])
+                self._rebuild_streak(conn, activity_type)
     
-    def get_streak_count(self, activity_type=None):
-        """Calculate current consecutive streak."""
+    def _advance_streak(self, conn, activity_type, date):
+        """Extend or reset the stored streak for a newly recorded day."""
+        state = conn.execute("""
+            SELECT current_streak, longest_streak, last_active_date
+            FROM streak_state WHERE activity_type = ?
+        """, (activity_type,)).fetchone()
+        
+        if state is None or state['last_active_date'] is None:
+            self._rebuild_streak(conn, activity_type)
+            return
+        
+        gap = (datetime.fromisoformat(date).date()
+               - datetime.fromisoformat(state['last_active_date']).date()).days
+        if gap == 0:
+            return
+        if gap < 0:
+            # A back-filled day can join or split older runs
+            self._rebuild_streak(conn, activity_type)
+            return
+        
+        current = state['current_streak'] + 1 if gap == 1 else 1
+        conn.execute("""
+            UPDATE streak_state
+            SET current_streak = ?, longest_streak = MAX(longest_streak, ?),
+                last_active_date = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE activity_type = ?
+        """, (current, current, date, activity_type))
+    
+    def _rebuild_streak(self, conn, activity_type):
+        """Recompute one streak_state row from both user_streaks tiers (gaps and islands)."""
+        type_filter = "" if activity_type == STREAK_ALL else "WHERE activity_type = ?"
+        params = () if activity_type == STREAK_ALL else (activity_type,)
+        
+        # Consecutive days share the same (day - row_number) island key
+        state = conn.execute(f"""
+            WITH islands AS (
+                SELECT COUNT(*) AS length, MAX(day) AS end_day
+                FROM (
+                    SELECT julianday(date) AS day,
+                           julianday(date) - ROW_NUMBER() OVER (ORDER BY date) AS island
+                    FROM user_streaks_all {type_filter}
+                )
+                GROUP BY island
+            )
+            SELECT (SELECT length FROM islands ORDER BY end_day DESC LIMIT 1) AS current_streak,
+                   MAX(length) AS longest_streak,
+                   date(MAX(end_day)) AS last_active_date
+            FROM islands
+        """, params).fetchone()
+        
+        conn.execute("""
+            INSERT OR REPLACE INTO streak_state
+                (activity_type, current_streak, longest_streak, last_active_date)
+            VALUES (?, ?, ?, ?)
+        """, (activity_type, state['current_streak'] or 0, state['longest_streak'] or 0,
+              state['last_active_date']))
+    
+    @invalidates('streak_state')
+    def rebuild_streak_state(self):
+        """Recompute every streak_state row from the full user_streaks history."""
         with self.get_connection() as conn:
-            query = "SELECT date FROM user_streaks"
-            params = []
-            
-            if activity_type:
-                query += " WHERE activity_type = ?"
-                params.append(activity_type)
-            
-            query += " ORDER BY date DESC"
-            
-            cursor = conn.execute(query, params)
-            dates = [row['date'] for row in cursor.fetchall()]
-            
-            if not dates:
-                return 0
-            
-            # Calculate streak
-            streak = 1
-            current_date = datetime.fromisoformat(dates[0]).date()
-            
-            for date_str in dates[1:]:
-                date = datetime.fromisoformat(date_str).date()
-                if (current_date - date).days == 1:
-                    streak += 1
-                    current_date = date
-                else:
-                    break
-            
-            return streak
+            self._begin(conn)
+            activity_types = {STREAK_ALL}
+            activity_types.update(
+                row['activity_type'] for row in conn.execute(
+                    "SELECT DISTINCT activity_type FROM user_streaks_all"
+                )
+            )
+            activity_types.update(
+                row['activity_type'] for row in conn.execute(
+                    "SELECT activity_type FROM streak_state"
+                )
+            )
+            for activity_type in activity_types:
+                self._rebuild_streak(conn, activity_type)
+    
+    @cached_read('user_streaks', 'streak_state')
+    def get_streak_state(self, activity_type=None):
+        """Get current streak, longest streak and last active date for an activity type."""
+        activity_type = activity_type or STREAK_ALL
+        with self.get_connection() as conn:
+            query = """
+                SELECT activity_type, current_streak, longest_streak, last_active_date
+                FROM streak_state WHERE activity_type = ?
+            """
+            row = conn.execute(query, (activity_type,)).fetchone()
+            if row is None:
+                # First lookup for this type (e.g. right after the migration)
+                self._begin(conn)
+                self._rebuild_streak(conn, activity_type)
+                row = conn.execute(query, (activity_type,)).fetchone()
+            return dict(row)
+    
+    def get_streak_count(self, activity_type=None):
+        """Get current consecutive streak (a single-row lookup)."""
+        return self.get_streak_state(activity_type)['current_streak']
     
-    def get_streaks_history(self, days=30):
+    def get_streaks_history(self, days=30, include_archived=False):
         """Get streak history for the last N days."""
+        source = 'user_streaks_all' if include_archived else 'user_streaks'
         with self.get_connection() as conn:
             start_date = (datetime.now().date() - timedelta(days=days)).isoformat()
-            cursor = conn.execute("""
-                SELECT * FROM user_streaks
+            cursor = conn.execute(f"""
+                SELECT * FROM {source}
                 WHERE date >= ?
                 ORDER BY date DESC
             """, (start_date,))
             return [dict(row) for row in cursor.fetchall()]
     
     # Praise Messages (NEW)
+    @invalidates('praise_messages')
     def save_praise_message(self, message, task_id=None, context=None):
         """Store AI-generated praise."""
         with self.get_connection() as conn:
@@ -340,9 +1099,9 @@ class DatabaseManager:
                 INSERT INTO praise_messages (message, task_id, context)
                 VALUES (?, ?, ?)
             """, (message, task_id, context))
-            conn.commit()
             return cursor.lastrowid
     
+    @cached_read('praise_messages')
     def get_latest_praise(self, limit=1):
         """Get most recent praise message(s)."""
         with self.get_connection() as conn:
@@ -354,13 +1113,160 @@ class DatabaseManager:
             results = [dict(row) for row in cursor.fetchall()]
             return results[0] if limit == 1 and results else results
     
-    def get_praise_history(self, days=7):
+    def get_praise_history(self, days=7, include_archived=False):
         """Get recent praise messages."""
+        source = 'praise_messages_all' if include_archived else 'praise_messages'
         with self.get_connection() as conn:
             start_date = (datetime.now() - timedelta(days=days)).isoformat()
-            cursor = conn.execute("""
-                SELECT * FROM praise_messages
+            cursor = conn.execute(f"""
+                SELECT * FROM {source}
                 WHERE created_at >= ?
                 ORDER BY created_at DESC
             """, (start_date,))
             return [dict(row) for row in cursor.fetchall()]
+    
+    # Archive tier and compaction
+    @invalidates('tasks', 'progress_history', 'praise_messages', 'user_streaks')
+    def archive_old_rows(self, retention_days=None, today=None):
+        """Move rows past their retention horizon into the archive tables.
+        
+        `retention_days` overrides ARCHIVE_POLICIES per table, e.g. {'tasks': 7}.
+        Runs as one transaction; archived progress stays counted in progress_daily
+        and archived streak days still count towards streak_state.
+        Returns the number of rows moved per table.
+        """
+        today = today or datetime.now().date()
+        retention_days = retention_days or {}
+        moved = {}
+        
+        with self.transaction():
+            with self.get_connection() as conn:
+                # Keeps the progress_daily delete trigger from subtracting archived sessions
+                conn.execute("INSERT OR REPLACE INTO maintenance_state (key, value) VALUES ('archiving', '1')")
+                
+                for table, (archive_table, age_column, condition, default_days) in ARCHIVE_POLICIES.items():
+                    horizon = (today - timedelta(days=retention_days.get(table, default_days))).isoformat()
+                    where = f"{age_column} < ?" + (f" AND {condition}" if condition else "")
+                    columns = ", ".join(self._columns_of(table, generated=False))
+                    
+                    conn.execute(f"""
+                        INSERT OR REPLACE INTO {archive_table} ({columns})
+                        SELECT {columns} FROM {table} WHERE {where}
+                    """, (horizon,))
+                    moved[table] = conn.execute(f"DELETE FROM {table} WHERE {where}", (horizon,)).rowcount
+                
+                conn.execute("DELETE FROM maintenance_state WHERE key = 'archiving'")
+        
+        return moved
+    
+    def compact(self, retention_days=None, today=None):
+        """Archive old rows, then refresh planner statistics and checkpoint the WAL."""
+        today = today or datetime.now().date()
+        moved = self.archive_old_rows(retention_days, today)
+        
+        with self.get_connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO maintenance_state (key, value, updated_at)
+                VALUES ('last_compaction', ?, CURRENT_TIMESTAMP)
+            """, (today.isoformat(),))
+        
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA optimize")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return moved
+    
+    def compact_if_due(self, interval_days=COMPACTION_INTERVAL_DAYS, today=None):
+        """Run compact() when the last run is at least `interval_days` old; None when not due."""
+        today = today or datetime.now().date()
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM maintenance_state WHERE key = 'last_compaction'"
+            ).fetchone()
+        
+        if row and (today - date_type.fromisoformat(row['value'])).days < interval_days:
+            return None
+        return self.compact(today=today)
+    
+    # Status sweeps
+    @invalidates('tasks', 'deadlines')
+    def sweep_statuses(self, today=None):
+        """Mark open tasks past their due date overdue and open deadlines past their date missed.
+        
+        One set-based UPDATE per table that seeks the (status, date) index, so
+        only rows that lapsed since the last sweep are touched. Returns the
+        number of rows changed per table.
+        """
+        today = today or datetime.now().date()
+        swept = {}
+        
+        with self.transaction():
+            with self.get_connection() as conn:
+                for table, (date_column, open_statuses, lapsed_status) in STATUS_SWEEPS.items():
+                    swept[table] = conn.execute(f"""
+                        UPDATE {table} SET status = ?
+                        WHERE status IN ({', '.join('?' * len(open_statuses))})
+                          AND {date_column} < ? AND {date_column} <> ''
+                    """, (lapsed_status, *open_statuses, today.isoformat())).rowcount
+                
+                conn.execute("""
+                    INSERT OR REPLACE INTO maintenance_state (key, value, updated_at)
+                    VALUES ('last_status_sweep', ?, CURRENT_TIMESTAMP)
+                """, (today.isoformat(),))
+        
+        return swept
+    
+    def sweep_statuses_if_due(self, today=None):
+        """Run sweep_statuses() unless it already ran today; None when not due."""
+        today = today or datetime.now().date()
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM maintenance_state WHERE key = 'last_status_sweep'"
+            ).fetchone()
+        
+        if row and row['value'] == today.isoformat():
+            return None
+        return self.sweep_statuses(today)
+    
+    # Backups
+    def backup(self, backup_dir=None, keep=DEFAULT_KEEP):
+        """Snapshot the live database with the online backup API; returns the snapshot path.
+        
+        Copies in small page steps so other requests keep reading and writing,
+        and keeps the `keep` newest snapshots.
+        """
+        return create_snapshot(self.db_path, backup_dir, keep)
+    
+    def backup_if_due(self, interval_hours=BACKUP_INTERVAL_HOURS, backup_dir=None, keep=DEFAULT_KEEP):
+        """Take a snapshot when the newest one is older than `interval_hours`; None when not due."""
+        if backup_lock(self.db_path).locked() or not snapshot_is_due(self.db_path, interval_hours, backup_dir):
+            return None
+        return self.backup(backup_dir, keep)
+    
+    def list_backups(self, backup_dir=None, pre_restore=False):
+        """Snapshot paths of this database, newest first; `pre_restore=True` lists the ones restore kept."""
+        return list_snapshots(self.db_path, backup_dir, PRE_RESTORE_TAG if pre_restore else None)
+    
+    def restore(self, snapshot_path, backup_dir=None):
+        """Replace the database contents with a snapshot.
+        
+        The current contents are snapshotted first, as a pre-restore snapshot
+        that rotation never deletes (see list_backups(pre_restore=True)), so a
+        restore can be undone.
+        Migrations are re-applied in case the snapshot predates the current
+        schema, and every cached read is invalidated.
+        """
+        if self.in_transaction():
+            raise sqlite3.ProgrammingError("Cannot restore inside a transaction")
+        
+        # The safety snapshot and the restore happen under one hold of the lock,
+        # so a background backup cannot snapshot or rotate in between
+        with backup_lock(self.db_path):
+            safety_snapshot = write_snapshot(self.db_path, backup_dir, keep=None, tag=PRE_RESTORE_TAG)
+            with self.get_connection() as conn:
+                restore_snapshot(snapshot_path, conn)
+                tables = [row['name'] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        
+        self._table_columns.clear()
+        self.init_database()
+        bump_generations(self.table_generations, set(tables) | set(self.table_generations))
+        return safety_snapshot
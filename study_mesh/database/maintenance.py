@@ -0,0 +1,82 @@
+"""Maintenance commands for the StudyMesh database.
+
+Run from the study_mesh folder, e.g.::
+
+    python -m database.maintenance rebuild-rollups
+    python -m database.maintenance backup --keep 14
+    python -m database.maintenance restore database/backups/planner-<timestamp>.db
+"""
+import argparse
+import sys
+
+from .backup import DEFAULT_KEEP
+from .db_manager import DB_PATH, DatabaseManager
+
+
+def rebuild_rollups(db, args):
+    """Recompute the trigger-maintained progress_daily and streak_state tables."""
+    days = db.rebuild_progress_daily()
+    db.rebuild_streak_state()
+    print(f"Rebuilt progress_daily ({days} days) and streak_state")
+
+
+def compact(db, args):
+    """Archive rows past their retention horizon and checkpoint the WAL now."""
+    moved = db.compact()
+    print("Archived " + ", ".join(f"{count} {table}" for table, count in moved.items()))
+
+
+def sweep(db, args):
+    """Mark tasks past their due date overdue and deadlines past their date missed."""
+    swept = db.sweep_statuses()
+    print(f"Marked {swept['tasks']} tasks overdue and {swept['deadlines']} deadlines missed")
+
+
+def backup(db, args):
+    """Snapshot the database (safe while the app is running) and rotate old snapshots."""
+    print(f"Wrote {db.backup(args.backup_dir, args.keep)}")
+
+
+def list_backups(db, args):
+    """Print the snapshots of the database, newest first."""
+    for path in db.list_backups(args.backup_dir, args.pre_restore):
+        print(path)
+
+
+def restore(db, args):
+    """Replace the database with a snapshot, keeping a snapshot of the current contents."""
+    safety_snapshot = db.restore(args.snapshot, args.backup_dir)
+    print(f"Restored {args.snapshot} (previous contents saved to {safety_snapshot})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="StudyMesh database maintenance.")
+    parser.add_argument("--db", default=DB_PATH, help=f"Database file (default: {DB_PATH})")
+    parser.add_argument("--backup-dir", help="Snapshot folder (default: backups/ next to the database)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("rebuild-rollups", help=rebuild_rollups.__doc__).set_defaults(run=rebuild_rollups)
+    commands.add_parser("compact", help=compact.__doc__).set_defaults(run=compact)
+    commands.add_parser("sweep", help=sweep.__doc__).set_defaults(run=sweep)
+    backup_parser = commands.add_parser("backup", help=backup.__doc__)
+    backup_parser.add_argument("--keep", type=int, default=DEFAULT_KEEP, help="Snapshots to keep")
+    backup_parser.set_defaults(run=backup)
+    list_parser = commands.add_parser("list-backups", help=list_backups.__doc__)
+    list_parser.add_argument("--pre-restore", action="store_true",
+                             help="List the snapshots restore took of the replaced contents instead")
+    list_parser.set_defaults(run=list_backups)
+    restore_parser = commands.add_parser("restore", help=restore.__doc__)
+    restore_parser.add_argument("snapshot", help="Snapshot file to restore")
+    restore_parser.set_defaults(run=restore)
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(args.db, pool_size=1)
+    try:
+        args.run(db, args)
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+-- Secondary indexes for the DatabaseManager read paths.
+-- Each index leads with the equality filter and continues with the ORDER BY
+-- columns so SQLite can both seek and return rows already sorted.
+
+-- get_tasks(task_type, status): ORDER BY priority DESC, due_date ASC
+CREATE INDEX IF NOT EXISTS idx_tasks_type_status_priority
+    ON tasks (task_type, status, priority DESC, due_date);
+
+-- get_tasks(task_type=...) without a status filter
+CREATE INDEX IF NOT EXISTS idx_tasks_type_priority
+    ON tasks (task_type, priority DESC, due_date);
+
+-- get_tasks(status=...) without a type filter
+CREATE INDEX IF NOT EXISTS idx_tasks_status_priority
+    ON tasks (status, priority DESC, due_date);
+
+-- get_deadlines(status): ORDER BY deadline_date
+CREATE INDEX IF NOT EXISTS idx_deadlines_status_date
+    ON deadlines (status, deadline_date);
+
+-- get_progress(start_date, end_date): range on date; study_hours makes hour sums covering
+CREATE INDEX IF NOT EXISTS idx_progress_date_hours
+    ON progress_history (date, study_hours);
+
+-- get_papers(is_read): ORDER BY published_date DESC
+CREATE INDEX IF NOT EXISTS idx_papers_read_published
+    ON papers (is_read, published_date DESC);
+
+-- get_papers() without a filter, newest first
+CREATE INDEX IF NOT EXISTS idx_papers_published
+    ON papers (published_date DESC);
+
+-- get_praise_history / get_latest_praise: range and order on created_at
+CREATE INDEX IF NOT EXISTS idx_praise_created
+    ON praise_messages (created_at);
+
+-- get_posts(is_posted): ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_posts_posted_created
+    ON social_posts (is_posted, created_at DESC);
+
+-- get_active_reminders: is_active = 1 AND is_dismissed = 0 ORDER BY target_date
+CREATE INDEX IF NOT EXISTS idx_reminders_active
+    ON reminders (is_active, is_dismissed, target_date);
+
+-- get_streak_count(activity_type): dates for one activity type
+CREATE INDEX IF NOT EXISTS idx_streaks_type_date
+    ON user_streaks (activity_type, date);
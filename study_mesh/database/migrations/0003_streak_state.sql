@@ -0,0 +1,10 @@
+-- Maintained streak summary, one row per activity type plus 'all' for any activity.
+-- DatabaseManager.update_streak advances it in the same transaction as the
+-- user_streaks insert; rebuild_streak_state() recomputes it from history.
+CREATE TABLE IF NOT EXISTS streak_state (
+    activity_type TEXT PRIMARY KEY,
+    current_streak INTEGER NOT NULL DEFAULT 0,
+    longest_streak INTEGER NOT NULL DEFAULT 0,
+    last_active_date TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,4 @@
+-- Keyset pagination bounds descending leading keys with a plain "<= ?" so
+-- SQLite can seek the index; that bound skips NULLs, so store 0 / '' instead.
+UPDATE tasks SET priority = 0 WHERE priority IS NULL;
+UPDATE papers SET published_date = '' WHERE published_date IS NULL;
@@ -0,0 +1,78 @@
+-- FTS5 indexes over the saved library, tasks and deadlines.
+-- External-content tables store only the index; triggers keep them in sync
+-- with their source rows and the final 'rebuild' backfills existing data.
+
+-- Papers
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, summary, authors,
+    content='papers', content_rowid='id', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts (rowid, title, abstract, summary, authors)
+    VALUES (new.id, new.title, new.abstract, new.summary, new.authors);
+END;
+
+CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract, summary, authors)
+    VALUES ('delete', old.id, old.title, old.abstract, old.summary, old.authors);
+END;
+
+CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE OF title, abstract, summary, authors ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract, summary, authors)
+    VALUES ('delete', old.id, old.title, old.abstract, old.summary, old.authors);
+    INSERT INTO papers_fts (rowid, title, abstract, summary, authors)
+    VALUES (new.id, new.title, new.abstract, new.summary, new.authors);
+END;
+
+INSERT INTO papers_fts (papers_fts) VALUES ('rebuild');
+
+-- Tasks
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title, description,
+    content='tasks', content_rowid='id', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO tasks_fts (rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+
+INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild');
+
+-- Deadlines
+CREATE VIRTUAL TABLE IF NOT EXISTS deadlines_fts USING fts5(
+    title, description, requirements,
+    content='deadlines', content_rowid='id', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS deadlines_fts_insert AFTER INSERT ON deadlines BEGIN
+    INSERT INTO deadlines_fts (rowid, title, description, requirements)
+    VALUES (new.id, new.title, new.description, new.requirements);
+END;
+
+CREATE TRIGGER IF NOT EXISTS deadlines_fts_delete AFTER DELETE ON deadlines BEGIN
+    INSERT INTO deadlines_fts (deadlines_fts, rowid, title, description, requirements)
+    VALUES ('delete', old.id, old.title, old.description, old.requirements);
+END;
+
+CREATE TRIGGER IF NOT EXISTS deadlines_fts_update AFTER UPDATE OF title, description, requirements ON deadlines BEGIN
+    INSERT INTO deadlines_fts (deadlines_fts, rowid, title, description, requirements)
+    VALUES ('delete', old.id, old.title, old.description, old.requirements);
+    INSERT INTO deadlines_fts (rowid, title, description, requirements)
+    VALUES (new.id, new.title, new.description, new.requirements);
+END;
+
+INSERT INTO deadlines_fts (deadlines_fts) VALUES ('rebuild');
@@ -0,0 +1,77 @@
+-- Daily rollup of progress_history, maintained by triggers so charts and
+-- weekly summaries read one row per day instead of every study session.
+-- task_count is the number of distinct tasks worked on that day.
+
+CREATE TABLE IF NOT EXISTS progress_daily (
+    date DATE PRIMARY KEY,
+    total_hours REAL NOT NULL DEFAULT 0,
+    session_count INTEGER NOT NULL DEFAULT 0,
+    task_count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Lets the triggers check whether a task already has a session on a date
+CREATE INDEX IF NOT EXISTS idx_progress_date_task
+    ON progress_history (date, task_id);
+
+CREATE TRIGGER IF NOT EXISTS progress_daily_insert AFTER INSERT ON progress_history BEGIN
+    INSERT INTO progress_daily (date, total_hours, session_count, task_count)
+    VALUES (new.date, IFNULL(new.study_hours, 0), 1, new.task_id IS NOT NULL)
+    ON CONFLICT (date) DO UPDATE SET
+        total_hours = total_hours + excluded.total_hours,
+        session_count = session_count + 1,
+        task_count = task_count + (
+            new.task_id IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM progress_history
+                WHERE date = new.date AND task_id = new.task_id AND id <> new.id
+            )
+        );
+END;
+
+CREATE TRIGGER IF NOT EXISTS progress_daily_delete AFTER DELETE ON progress_history BEGIN
+    UPDATE progress_daily SET
+        total_hours = total_hours - IFNULL(old.study_hours, 0),
+        session_count = session_count - 1,
+        task_count = task_count - (
+            old.task_id IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM progress_history
+                WHERE date = old.date AND task_id = old.task_id
+            )
+        )
+    WHERE date = old.date;
+    DELETE FROM progress_daily WHERE date = old.date AND session_count <= 0;
+END;
+
+-- Remove the old values from their day, then add the new ones; a task only
+-- counts again when the session moved to another date or task
+CREATE TRIGGER IF NOT EXISTS progress_daily_update AFTER UPDATE OF date, study_hours, task_id ON progress_history BEGIN
+    UPDATE progress_daily SET
+        total_hours = total_hours - IFNULL(old.study_hours, 0),
+        session_count = session_count - 1,
+        task_count = task_count - (
+            old.task_id IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM progress_history
+                WHERE date = old.date AND task_id = old.task_id
+            )
+        )
+    WHERE date = old.date;
+    DELETE FROM progress_daily WHERE date = old.date AND session_count <= 0;
+    INSERT INTO progress_daily (date, total_hours, session_count, task_count)
+    VALUES (new.date, IFNULL(new.study_hours, 0), 1, new.task_id IS NOT NULL)
+    ON CONFLICT (date) DO UPDATE SET
+        total_hours = total_hours + excluded.total_hours,
+        session_count = session_count + 1,
+        task_count = task_count + (
+            new.task_id IS NOT NULL
+            AND (new.date IS NOT old.date OR new.task_id IS NOT old.task_id)
+            AND NOT EXISTS (
+                SELECT 1 FROM progress_history
+                WHERE date = new.date AND task_id = new.task_id AND id <> new.id
+            )
+        );
+END;
+
+-- Backfill from existing history
+INSERT OR REPLACE INTO progress_daily (date, total_hours, session_count, task_count)
+SELECT date, SUM(IFNULL(study_hours, 0)), COUNT(*), COUNT(DISTINCT task_id)
+FROM progress_history
+GROUP BY date;
@@ -0,0 +1,111 @@
+-- Archive tier: rows past their retention horizon move out of the hot tables
+-- into these archive tables. They live in the same file but in separate
+-- B-trees, so the hot tables and their indexes stay small enough to stay in
+-- the page cache. The *_all views span both tiers for queries that ask for
+-- archived rows.
+
+CREATE TABLE IF NOT EXISTS tasks_archive (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    task_type TEXT,
+    priority INTEGER DEFAULT 0,
+    estimated_hours REAL,
+    status TEXT,
+    due_date DATE,
+    completed_at TIMESTAMP,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_archive_type_status
+    ON tasks_archive (task_type, status);
+
+CREATE TABLE IF NOT EXISTS progress_history_archive (
+    id INTEGER PRIMARY KEY,
+    task_id INTEGER,
+    study_hours REAL,
+    notes TEXT,
+    date DATE NOT NULL,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_progress_archive_date
+    ON progress_history_archive (date);
+
+CREATE TABLE IF NOT EXISTS praise_messages_archive (
+    id INTEGER PRIMARY KEY,
+    message TEXT NOT NULL,
+    task_id INTEGER,
+    context TEXT,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_praise_archive_created
+    ON praise_messages_archive (created_at);
+
+CREATE TABLE IF NOT EXISTS user_streaks_archive (
+    id INTEGER PRIMARY KEY,
+    date TEXT UNIQUE NOT NULL,
+    activity_type TEXT,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_streaks_archive_type_date
+    ON user_streaks_archive (activity_type, date);
+
+-- Both tiers together
+CREATE VIEW IF NOT EXISTS tasks_all AS
+    SELECT id, title, description, task_type, priority, estimated_hours, status, due_date, completed_at, created_at
+    FROM tasks
+    UNION ALL
+    SELECT id, title, description, task_type, priority, estimated_hours, status, due_date, completed_at, created_at
+    FROM tasks_archive;
+
+CREATE VIEW IF NOT EXISTS progress_history_all AS
+    SELECT id, task_id, study_hours, notes, date, created_at FROM progress_history
+    UNION ALL
+    SELECT id, task_id, study_hours, notes, date, created_at FROM progress_history_archive;
+
+CREATE VIEW IF NOT EXISTS praise_messages_all AS
+    SELECT id, message, task_id, context, created_at FROM praise_messages
+    UNION ALL
+    SELECT id, message, task_id, context, created_at FROM praise_messages_archive;
+
+-- A day re-recorded after its row was archived counts once
+CREATE VIEW IF NOT EXISTS user_streaks_all AS
+    SELECT id, date, activity_type, created_at FROM user_streaks
+    UNION ALL
+    SELECT id, date, activity_type, created_at FROM user_streaks_archive
+    WHERE date NOT IN (SELECT date FROM user_streaks);
+
+-- Maintenance bookkeeping: when compaction last ran, and an 'archiving'
+-- marker that exists only inside the archiving transaction
+CREATE TABLE IF NOT EXISTS maintenance_state (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Archived sessions still count in progress_daily, so moving them out of
+-- progress_history must not subtract them
+DROP TRIGGER IF EXISTS progress_daily_delete;
+
+CREATE TRIGGER progress_daily_delete AFTER DELETE ON progress_history
+WHEN NOT EXISTS (SELECT 1 FROM maintenance_state WHERE key = 'archiving')
+BEGIN
+    UPDATE progress_daily SET
+        total_hours = total_hours - IFNULL(old.study_hours, 0),
+        session_count = session_count - 1,
+        task_count = task_count - (
+            old.task_id IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM progress_history
+                WHERE date = old.date AND task_id = old.task_id
+            )
+        )
+    WHERE date = old.date;
+    DELETE FROM progress_daily WHERE date = old.date AND session_count <= 0;
+END;
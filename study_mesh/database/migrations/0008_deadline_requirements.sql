@@ -0,0 +1,82 @@
+-- One row per deadline requirement, so ticking an item updates a single row
+-- instead of rewriting the newline-joined completed_requirements blob.
+-- deadlines.requirements keeps the joined text for full-text search.
+
+CREATE TABLE IF NOT EXISTS deadline_requirements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    deadline_id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    position INTEGER NOT NULL
+);
+
+-- get_requirements: a deadline's checklist in order
+CREATE UNIQUE INDEX IF NOT EXISTS idx_deadline_requirements_deadline_position
+    ON deadline_requirements (deadline_id, position);
+
+-- Per-deadline progress, maintained by the triggers below so list views get
+-- "3 of 5 done" with the deadline row itself
+ALTER TABLE deadlines ADD COLUMN requirements_total INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE deadlines ADD COLUMN requirements_done INTEGER NOT NULL DEFAULT 0;
+
+CREATE TRIGGER IF NOT EXISTS deadline_requirements_insert AFTER INSERT ON deadline_requirements BEGIN
+    UPDATE deadlines SET
+        requirements_total = requirements_total + 1,
+        requirements_done = requirements_done + new.done
+    WHERE id = new.deadline_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS deadline_requirements_delete AFTER DELETE ON deadline_requirements BEGIN
+    UPDATE deadlines SET
+        requirements_total = requirements_total - 1,
+        requirements_done = requirements_done - old.done
+    WHERE id = old.deadline_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS deadline_requirements_update AFTER UPDATE OF done ON deadline_requirements BEGIN
+    UPDATE deadlines SET
+        requirements_done = requirements_done + new.done - old.done
+    WHERE id = new.deadline_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS deadlines_requirements_cleanup AFTER DELETE ON deadlines BEGIN
+    DELETE FROM deadline_requirements WHERE deadline_id = old.id;
+END;
+
+-- Backfill: split the existing requirement text into rows (blank lines and
+-- surrounding whitespace dropped, as the Deadlines page did when rendering)
+WITH RECURSIVE lines (deadline_id, line, rest, position) AS (
+    SELECT id, NULL, replace(requirements, char(13), '') || char(10), 0
+    FROM deadlines
+    WHERE requirements IS NOT NULL AND trim(requirements) <> ''
+    UNION ALL
+    SELECT deadline_id,
+           trim(substr(rest, 1, instr(rest, char(10)) - 1), ' ' || char(9)),
+           substr(rest, instr(rest, char(10)) + 1),
+           position + 1
+    FROM lines
+    WHERE rest <> ''
+)
+INSERT INTO deadline_requirements (deadline_id, text, position)
+SELECT deadline_id, line, position
+FROM lines
+WHERE position > 0 AND line <> '';
+
+-- ...and mark the ones listed in completed_requirements as done
+WITH RECURSIVE completed (deadline_id, line, rest) AS (
+    SELECT id, NULL, replace(completed_requirements, char(13), '') || char(10)
+    FROM deadlines
+    WHERE completed_requirements IS NOT NULL AND trim(completed_requirements) <> ''
+    UNION ALL
+    SELECT deadline_id,
+           trim(substr(rest, 1, instr(rest, char(10)) - 1), ' ' || char(9)),
+           substr(rest, instr(rest, char(10)) + 1)
+    FROM completed
+    WHERE rest <> ''
+)
+UPDATE deadline_requirements SET done = 1
+WHERE EXISTS (
+    SELECT 1 FROM completed
+    WHERE completed.deadline_id = deadline_requirements.deadline_id
+      AND completed.line = deadline_requirements.text
+);
@@ -0,0 +1,5 @@
+-- sweep_statuses marks open tasks past their due date overdue with one
+-- UPDATE ... WHERE status IN (...) AND due_date < ?; this index lets it seek
+-- straight to the lapsed rows. Deadlines already have (status, deadline_date).
+CREATE INDEX IF NOT EXISTS idx_tasks_status_due
+    ON tasks (status, due_date);
@@ -0,0 +1,38 @@
+-- Integer day numbers (days since 1970-01-01) derived from the TEXT date
+-- columns. completed_at is a Python isoformat() timestamp, due_date and
+-- deadline_date are ISO dates; date() normalises all of them, so range
+-- queries compare integers instead of string prefixes. The columns are
+-- VIRTUAL: nothing extra is stored in the table, only in the indexes.
+
+ALTER TABLE tasks ADD COLUMN completed_day INTEGER
+    GENERATED ALWAYS AS (CAST(julianday(date(completed_at)) - 2440587.5 AS INTEGER)) VIRTUAL;
+ALTER TABLE tasks ADD COLUMN due_day INTEGER
+    GENERATED ALWAYS AS (CAST(julianday(date(due_date)) - 2440587.5 AS INTEGER)) VIRTUAL;
+
+ALTER TABLE tasks_archive ADD COLUMN completed_day INTEGER
+    GENERATED ALWAYS AS (CAST(julianday(date(completed_at)) - 2440587.5 AS INTEGER)) VIRTUAL;
+ALTER TABLE tasks_archive ADD COLUMN due_day INTEGER
+    GENERATED ALWAYS AS (CAST(julianday(date(due_date)) - 2440587.5 AS INTEGER)) VIRTUAL;
+
+ALTER TABLE deadlines ADD COLUMN deadline_day INTEGER
+    GENERATED ALWAYS AS (CAST(julianday(date(deadline_date)) - 2440587.5 AS INTEGER)) VIRTUAL;
+
+-- tasks_completed_between / count_tasks_completed_between: range on the day,
+-- task_type keeps per-type counts inside the index
+CREATE INDEX IF NOT EXISTS idx_tasks_completed_day
+    ON tasks (completed_day, task_type);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_archive_completed_day
+    ON tasks_archive (completed_day, task_type);
+
+-- Expose the day numbers through the two-tier view as well
+DROP VIEW IF EXISTS tasks_all;
+
+CREATE VIEW tasks_all AS
+    SELECT id, title, description, task_type, priority, estimated_hours, status, due_date, completed_at, created_at,
+           completed_day, due_day
+    FROM tasks
+    UNION ALL
+    SELECT id, title, description, task_type, priority, estimated_hours, status, due_date, completed_at, created_at,
+           completed_day, due_day
+    FROM tasks_archive;
@@ -0,0 +1,79 @@
+-- progress_daily keeps counting archived sessions, so whether a task already
+-- has a session on a date must be checked in both tiers. Otherwise a session
+-- written (or moved, or deleted) on a day that also has archived sessions of
+-- the same task changes task_count when a rebuild would not.
+
+-- Lets the triggers look up archived sessions of a task on a date
+CREATE INDEX IF NOT EXISTS idx_progress_archive_date_task
+    ON progress_history_archive (date, task_id);
+
+DROP TRIGGER IF EXISTS progress_daily_insert;
+
+CREATE TRIGGER progress_daily_insert AFTER INSERT ON progress_history BEGIN
+    INSERT INTO progress_daily (date, total_hours, session_count, task_count)
+    VALUES (new.date, IFNULL(new.study_hours, 0), 1, new.task_id IS NOT NULL)
+    ON CONFLICT (date) DO UPDATE SET
+        total_hours = total_hours + excluded.total_hours,
+        session_count = session_count + 1,
+        task_count = task_count + (
+            new.task_id IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM progress_history_all
+                WHERE date = new.date AND task_id = new.task_id AND id <> new.id
+            )
+        );
+END;
+
+DROP TRIGGER IF EXISTS progress_daily_delete;
+
+CREATE TRIGGER progress_daily_delete AFTER DELETE ON progress_history
+WHEN NOT EXISTS (SELECT 1 FROM maintenance_state WHERE key = 'archiving')
+BEGIN
+    UPDATE progress_daily SET
+        total_hours = total_hours - IFNULL(old.study_hours, 0),
+        session_count = session_count - 1,
+        task_count = task_count - (
+            old.task_id IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM progress_history_all
+                WHERE date = old.date AND task_id = old.task_id
+            )
+        )
+    WHERE date = old.date;
+    DELETE FROM progress_daily WHERE date = old.date AND session_count <= 0;
+END;
+
+DROP TRIGGER IF EXISTS progress_daily_update;
+
+CREATE TRIGGER progress_daily_update AFTER UPDATE OF date, study_hours, task_id ON progress_history BEGIN
+    UPDATE progress_daily SET
+        total_hours = total_hours - IFNULL(old.study_hours, 0),
+        session_count = session_count - 1,
+        task_count = task_count - (
+            old.task_id IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM progress_history_all
+                WHERE date = old.date AND task_id = old.task_id
+            )
+        )
+    WHERE date = old.date;
+    DELETE FROM progress_daily WHERE date = old.date AND session_count <= 0;
+    INSERT INTO progress_daily (date, total_hours, session_count, task_count)
+    VALUES (new.date, IFNULL(new.study_hours, 0), 1, new.task_id IS NOT NULL)
+    ON CONFLICT (date) DO UPDATE SET
+        total_hours = total_hours + excluded.total_hours,
+        session_count = session_count + 1,
+        task_count = task_count + (
+            new.task_id IS NOT NULL
+            AND (new.date IS NOT old.date OR new.task_id IS NOT old.task_id)
+            AND NOT EXISTS (
+                SELECT 1 FROM progress_history_all
+                WHERE date = new.date AND task_id = new.task_id AND id <> new.id
+            )
+        );
+END;
+
+-- Counts already skewed by the old triggers are corrected from both tiers
+DELETE FROM progress_daily;
+
+INSERT INTO progress_daily (date, total_hours, session_count, task_count)
+SELECT date, SUM(IFNULL(study_hours, 0)), COUNT(*), COUNT(DISTINCT task_id)
+FROM progress_history_all
+GROUP BY date;
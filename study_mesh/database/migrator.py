@@ -0,0 +1,100 @@
+import os
+import re
+import sqlite3
+from functools import lru_cache
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+
+# Migration files are named NNNN_description.sql and applied in numeric order
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+
+@lru_cache(maxsize=None)
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Return (version, name, path) tuples for every migration file, sorted by version."""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration version in {directory}")
+    return tuple(migrations)
+
+
+def latest_version(directory=MIGRATIONS_DIR):
+    """Highest migration version shipped with the app."""
+    migrations = discover_migrations(directory)
+    return migrations[-1][0] if migrations else 0
+
+
+def get_schema_version(conn):
+    """Version recorded in the schema_version table (0 for a fresh or legacy database)."""
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def split_statements(sql):
+    """Split a migration script into complete statements (trigger bodies stay intact)."""
+    statements = []
+    buffer = ""
+    for line in sql.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip():
+                statements.append(buffer.strip())
+            buffer = ""
+    leftover = [l for l in buffer.splitlines() if l.strip() and not l.strip().startswith("--")]
+    if leftover:
+        raise ValueError(f"Incomplete SQL statement in migration: {leftover[0][:80]}")
+    return statements
+
+
+def apply_migrations(conn, directory=MIGRATIONS_DIR):
+    """Apply pending migrations; a single version check when the schema is current.
+
+    Each migration runs in its own BEGIN IMMEDIATE transaction together with
+    its schema_version row, so a failed migration leaves nothing half-applied
+    and concurrent processes never apply the same step twice.
+    """
+    target = latest_version(directory)
+    if get_schema_version(conn) >= target:
+        return target
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+
+    for version, name, path in discover_migrations(directory):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock in case another process got here first
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+
+            with open(path, 'r') as f:
+                for statement in split_statements(f.read()):
+                    conn.execute(statement)
+
+            conn.execute(
+                "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+                (version, name)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return get_schema_version(conn)
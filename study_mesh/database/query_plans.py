@@ -0,0 +1,129 @@
+"""Check that the hot DatabaseManager queries are served by indexes.
+
+Run ``python -m database.query_plans`` (from the study_mesh folder) to build a
+fresh database from the migrations, capture the SQL issued by each hot getter
+and run ``EXPLAIN QUERY PLAN`` on it. The command exits with status 1 when any
+statement falls back to a full table ``SCAN``, so it can gate CI.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from .db_manager import DatabaseManager
+
+# (method name, kwargs) pairs covering the filtered access paths the pages use
+HOT_QUERY_CALLS = (
+    ("get_tasks", {"task_type": "daily"}),
+    ("get_tasks", {"task_type": "daily", "status": "pending"}),
+    ("get_tasks", {"status": "completed"}),
+    ("get_tasks", {"task_type": "daily", "status": "pending", "limit": 20, "after": (3, "2024-01-01", 50)}),
+    ("get_deadlines", {"status": "pending"}),
+    ("get_deadlines", {"status": "pending", "limit": 20, "after": ("2024-01-01", 5)}),
+    ("get_deadlines", {"status": ("pending", "in_progress"), "limit": 20}),
+    ("get_deadlines", {"status": ("pending", "in_progress"), "due_by": "2024-01-31"}),
+    ("get_deadlines", {"status": "missed", "limit": 20}),
+    ("get_tasks", {"task_type": "daily", "status": "overdue", "limit": 20}),
+    ("get_requirements", {"deadline_ids": (1, 2, 3)}),
+    ("tasks_completed_between", {"start_date": "2024-01-01", "end_date": "2024-01-07"}),
+    ("count_tasks_completed_between", {"start_date": "2024-01-01", "end_date": "2024-01-07", "task_type": "daily"}),
+    ("count_tasks_completed_between", {"start_date": "2024-01-01", "end_date": "2024-01-31", "include_archived": True}),
+    ("get_progress", {"start_date": "2024-01-01", "end_date": "2024-01-31"}),
+    ("get_progress", {"start_date": "2024-01-01"}),
+    ("get_daily_progress", {"start_date": "2024-01-01", "end_date": "2024-01-31"}),
+    ("hours_by", {"period": "day", "start_date": "2024-01-01", "end_date": "2024-01-31"}),
+    ("progress_totals", {"start_date": "2024-01-01"}),
+    ("get_papers", {"is_read": 0, "limit": 20}),
+    ("get_papers", {"is_read": 1}),
+    ("get_papers", {"limit": 20}),
+    ("get_papers", {"is_read": 0, "limit": 20, "after": ("2024-01-01", 5)}),
+    ("get_posts", {"is_posted": 0}),
+    ("get_active_reminders", {}),
+    ("get_streak_count", {"activity_type": "github"}),
+    ("get_streaks_history", {"days": 30}),
+    ("get_latest_praise", {}),
+    ("get_praise_history", {"days": 7}),
+)
+
+
+def is_full_scan(detail, tables):
+    """True for a plan step that scans one of `tables` without any index.
+
+    Scans of CTEs and subqueries (such as the streak rebuild's islands) run over
+    rows already fetched through an index, so they are not flagged.
+    """
+    words = detail.split()
+    return len(words) >= 2 and words[0] == "SCAN" and words[1] in tables and "USING" not in words
+
+
+def explain_hot_queries(db_path, calls=HOT_QUERY_CALLS):
+    """Return [(call label, sql, [plan details], [full scan details])] per statement the hot calls run."""
+    # A single-connection pool guarantees the traced connection is the one the getters use
+    db = DatabaseManager(db_path, pool_size=1)
+    statements = []
+    conn = db.pool.acquire()
+    conn.set_trace_callback(statements.append)
+    tables = {row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    db.pool.release(conn)
+
+    results = []
+    try:
+        for method, kwargs in calls:
+            label = f"{method}({', '.join(f'{k}={v!r}' for k, v in kwargs.items())})"
+            statements.clear()
+            getattr(db, method)(**kwargs)
+            selects = [s for s in statements if s.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+            conn = db.pool.acquire()
+            try:
+                conn.set_trace_callback(None)
+                for sql in selects:
+                    details = [row["detail"] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+                    scans = [detail for detail in details if is_full_scan(detail, tables)]
+                    results.append((label, sql, details, scans))
+            finally:
+                conn.set_trace_callback(statements.append)
+                db.pool.release(conn)
+    finally:
+        db.close()
+    return results
+
+
+def find_full_scans(db_path, calls=HOT_QUERY_CALLS):
+    """Return the [(call label, sql, detail)] steps that scan a table without an index."""
+    return [
+        (label, sql, detail)
+        for label, sql, _, scans in explain_hot_queries(db_path, calls)
+        for detail in scans
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail if hot queries scan whole tables.")
+    parser.add_argument("--db", help="Database to check (default: a fresh temporary database)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every query plan")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = args.db or os.path.join(tmp_dir, "query_plans.db")
+        results = explain_hot_queries(db_path)
+
+    scans = []
+    for label, sql, details, step_scans in results:
+        if args.verbose:
+            print(f"{label}\n  {sql.strip()}")
+            for detail in details:
+                print(f"    {detail}")
+        scans.extend((label, detail) for detail in step_scans)
+
+    if scans:
+        for label, detail in scans:
+            print(f"FULL SCAN: {label}: {detail}")
+        return 1
+
+    print(f"OK: {len(results)} statements from {len(HOT_QUERY_CALLS)} hot calls use indexes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
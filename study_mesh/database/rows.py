@@ -0,0 +1,69 @@
+import keyword
+from collections import namedtuple
+from functools import lru_cache
+
+# Shapes DatabaseManager list getters can return rows in
+ROW_FORMATS = ('dict', 'tuple', 'object')
+
+
+@lru_cache(maxsize=None)
+def row_class(columns):
+    """Immutable `__slots__` row type for a column tuple.
+
+    A namedtuple underneath, so a row costs one tuple with no per-row dict,
+    but it also answers row['title'] and row.get('title') like the dict rows
+    the pages already use. Every column must be reachable by its SQL name, so
+    names that are not identifiers (COUNT(*), "x y") raise ValueError; alias
+    them with AS in the query.
+    """
+    invalid = [
+        name for name in columns
+        if not name.isidentifier() or keyword.iskeyword(name) or name.startswith('_')
+    ]
+    if invalid:
+        raise ValueError(f"Object rows need identifier column names; alias these with AS: {invalid}")
+    duplicates = sorted({name for name in columns if columns.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Object rows need unique column names; duplicated: {duplicates}")
+    base = namedtuple('Row', columns)
+
+    class Row(base):
+        __slots__ = ()
+
+        def __getitem__(self, key):
+            if isinstance(key, str):
+                try:
+                    return getattr(self, key)
+                except AttributeError:
+                    raise KeyError(key) from None
+            return tuple.__getitem__(self, key)
+
+        def get(self, key, default=None):
+            return getattr(self, key, default)
+
+        def keys(self):
+            return self._fields
+
+    return Row
+
+
+def fetch_rows(conn, query, params, row_format='dict'):
+    """Run a query and return every row in the requested shape.
+
+    Tuple and object rows skip sqlite3.Row entirely: the cursor hands back
+    plain tuples that are kept as they are or wrapped once in a row_class.
+    """
+    if row_format == 'dict':
+        return [dict(row) for row in conn.execute(query, params).fetchall()]
+
+    if row_format not in ROW_FORMATS:
+        raise ValueError(f"Unknown row_format {row_format!r}; expected one of {ROW_FORMATS}")
+
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    rows = cursor.execute(query, params).fetchall()
+    if row_format == 'tuple':
+        return rows
+
+    make_row = row_class(tuple(column[0] for column in cursor.description))._make
+    return [make_row(row) for row in rows]
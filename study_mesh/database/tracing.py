@@ -0,0 +1,130 @@
+import logging
+import re
+import threading
+import time
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+# DAL calls slower than this (ms) are written to the slow-query log
+SLOW_QUERY_MS = 100
+
+# Latency histograms are named db.<method>
+METRIC_PREFIX = "db."
+
+# DatabaseManager methods that are plumbing rather than queries
+UNTRACED_METHODS = frozenset({
+    'cache_stats', 'close', 'cursor_for', 'get_connection', 'in_transaction', 'init_database', 'transaction',
+})
+
+# Transaction control shows up in the trace but says nothing about the query
+_CONTROL_STATEMENTS = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE')
+
+# SQLite also traces trigger programs (prefixed "-- "), the statements
+# FTS5 runs on its shadow tables (quoted and schema-qualified, e.g.
+# 'main'.'tasks_fts_data') and its PRAGMA 'main'.data_version probe; they
+# belong to the statement that caused them, so they are not captured.
+# Other schema-qualified statements are.
+_TRIGGER_PREFIX = "--"
+_FTS_SHADOW_TABLE = re.compile(r"'[^']+'\.'[^']+_(?:data|idx|content|docsize|config)'")
+_DATA_VERSION_PROBE = re.compile(r"^PRAGMA\s+'?\w+'?\.data_version", re.IGNORECASE)
+
+# The trace callback sees statements with their parameters filled in;
+# string and number literals are folded back to ? so calls group together
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(sql):
+    """Statement text with literals replaced by ? and whitespace collapsed."""
+    return _WHITESPACE.sub(" ", _LITERALS.sub("?", sql)).strip()
+
+
+def _is_internal(sql):
+    """True for statements SQLite or FTS5 ran on the DAL's behalf."""
+    return (sql.startswith(_TRIGGER_PREFIX) or bool(_DATA_VERSION_PROBE.match(sql))
+            or bool(_FTS_SHADOW_TABLE.search(sql)))
+
+
+def _row_count(result):
+    """Rows a DAL call handed back: the length of a list, 0 for None, otherwise one value."""
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1
+
+
+class QueryTracer:
+    """Times DatabaseManager calls and captures the SQL they run.
+    
+    Each outermost call on a thread is one sample: its wall time and row
+    count go to a db.<method> latency histogram on the MetricsCollector,
+    with the statements it ran (via sqlite3's trace callback) as the sample
+    text. Calls slower than `slow_query_ms` are also added to the
+    collector's slow-query log. DAL methods calling each other count
+    towards the outer call.
+    """
+    
+    def __init__(self, metrics, slow_query_ms=SLOW_QUERY_MS):
+        self.metrics = metrics
+        self.slow_query_ms = slow_query_ms
+        # Statements captured for the call in progress on each thread
+        self._local = threading.local()
+    
+    def attach(self, conn):
+        """Capture the statements a connection runs (the ConnectionPool on_connect hook)."""
+        conn.set_trace_callback(self._capture)
+    
+    def _capture(self, sql):
+        statements = getattr(self._local, 'statements', None)
+        if statements is not None and not _is_internal(sql):
+            statements.append(sql)
+    
+    def wrap(self, name, method):
+        """Traced version of a bound DAL method."""
+        @wraps(method)
+        def traced(*args, **kwargs):
+            if getattr(self._local, 'statements', None) is not None:
+                return method(*args, **kwargs)
+            
+            statements = self._local.statements = []
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self._local.statements = None
+            
+            self.record(name, elapsed_ms, _row_count(result), statements)
+            return result
+        return traced
+    
+    def record(self, method, elapsed_ms, rows, statements):
+        """Report one call to the collector (and the slow-query log when over the threshold)."""
+        distinct = []
+        for sql in statements:
+            sql = normalize_statement(sql)
+            if sql.upper().startswith(_CONTROL_STATEMENTS) or (distinct and distinct[-1] == sql):
+                # executemany (and a statement that fires triggers) is traced repeatedly; keep one copy
+                continue
+            distinct.append(sql)
+        
+        self.metrics.observe_latency(METRIC_PREFIX + method, elapsed_ms, rows=rows, sample="; ".join(distinct))
+        
+        if elapsed_ms >= self.slow_query_ms:
+            self.metrics.log_slow_query({
+                "method": method,
+                "ms": round(elapsed_ms, 2),
+                "rows": rows,
+                "statements": distinct
+            })
+            logger.warning("Slow query: %s took %.1f ms (%d rows)", method, elapsed_ms, rows)
+
+
+def instrument(db, tracer):
+    """Replace a DatabaseManager's public query methods, on the instance, with traced versions."""
+    for name in dir(type(db)):
+        if name.startswith('_') or name in UNTRACED_METHODS or not callable(getattr(type(db), name)):
+            continue
+        setattr(db, name, tracer.wrap(name, getattr(db, name)))
@@ -0,0 +1,123 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from .db_manager import DB_PATH, DatabaseManager
+
+# The original single-user deployment keeps using planner.db
+DEFAULT_USER_ID = "user_default"
+
+# Every other student gets users/<user_id>.db next to planner.db
+USER_DB_DIR = os.path.join(os.path.dirname(DB_PATH), "users")
+
+DEFAULT_MAX_OPEN = 32
+
+# User ids become file names, so keep them to a safe character set
+USER_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+
+
+def is_valid_user_id(user_id):
+    return isinstance(user_id, str) and bool(USER_ID_PATTERN.match(user_id)) and ".." not in user_id
+
+
+def user_id_for_identity(identity):
+    """User id of a signed-in account (its email or subject claim).
+
+    The readable part is the identity with unsafe characters replaced; the
+    hash suffix keeps identities that sanitize alike (a+b@x.org, a_b@x.org)
+    on separate databases.
+    """
+    digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:12]
+    readable = re.sub(r"\.{2,}", ".", re.sub(r"[^A-Za-z0-9_.-]", "_", identity)).strip("._-")[:40]
+    return f"{readable or 'user'}-{digest}"
+
+
+class UserDatabases:
+    """Routes each user to a DatabaseManager on their own SQLite file.
+
+    Separate files keep every user's tables small and mean one student's
+    write lock never blocks another student's reads. At most `max_open`
+    managers are kept; the least recently used one is dropped from the LRU
+    and closed as soon as none of its connections is borrowed.
+    """
+
+    def __init__(self, base_dir=USER_DB_DIR, max_open=DEFAULT_MAX_OPEN,
+                 default_user_id=DEFAULT_USER_ID, default_db_path=DB_PATH, **db_kwargs):
+        if max_open < 1:
+            raise ValueError("max_open must be at least 1")
+        self.base_dir = base_dir
+        self.max_open = max_open
+        self.default_user_id = default_user_id
+        self.default_db_path = default_db_path
+        self.db_kwargs = db_kwargs
+        self.open_databases = OrderedDict()
+        # Evicted managers still lending out a connection, closed on a later get()
+        self.retired = []
+        self.lock = threading.Lock()
+
+    def path_for(self, user_id):
+        """Database file for a user."""
+        if not is_valid_user_id(user_id):
+            raise ValueError(f"Invalid user id {user_id!r}")
+        if user_id == self.default_user_id:
+            return self.default_db_path
+        return os.path.join(self.base_dir, f"{user_id}.db")
+
+    def get(self, user_id):
+        """Return the user's DatabaseManager, opening (and migrating) the file on first use."""
+        path = self.path_for(user_id)
+        with self.lock:
+            db = self.open_databases.get(user_id)
+            if db is not None:
+                self.open_databases.move_to_end(user_id)
+        if db is not None:
+            if self.retired:
+                self._close_retired()
+            return db
+
+        # Open outside the lock so a slow first-time migration does not stall other users
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        db = DatabaseManager(path, **self.db_kwargs)
+
+        with self.lock:
+            existing = self.open_databases.get(user_id)
+            if existing is not None:
+                # Another thread opened it meanwhile; keep theirs
+                self.open_databases.move_to_end(user_id)
+                db.close()
+                return existing
+
+            self.open_databases[user_id] = db
+            while len(self.open_databases) > self.max_open:
+                _, evicted = self.open_databases.popitem(last=False)
+                self.retired.append(evicted)
+
+        self._close_retired()
+        return db
+
+    def _close_retired(self):
+        """Close evicted managers that no longer have a connection borrowed."""
+        idle = []
+        with self.lock:
+            busy = []
+            for db in self.retired:
+                (busy if db.pool.in_use() else idle).append(db)
+            self.retired = busy
+        for db in idle:
+            db.close()
+
+    def open_users(self):
+        """User ids with an open DatabaseManager, least recently used first."""
+        with self.lock:
+            return list(self.open_databases)
+
+    def close(self):
+        """Close every open DatabaseManager."""
+        with self.lock:
+            databases = list(self.open_databases.values()) + self.retired
+            self.open_databases.clear()
+            self.retired = []
+        for db in databases:
+            db.close()
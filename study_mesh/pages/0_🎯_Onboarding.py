@@ -5,11 +5,10 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db_manager import DatabaseManager
-from src.agents.orchestrator import create_orchestrator_agent
-from src.session_manager import SessionManager
+from src.session_manager import get_session_manager
 import asyncio
 from src.config import APP_TITLE, APP_ICON
+from src.user_context import get_current_user_id, get_user_db
 
 # Page configuration
 st.set_page_config(
@@ -18,12 +17,9 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize database
-@st.cache_resource
-def init_db():
-    return DatabaseManager()
-
-db = init_db()
+# Open the current user's database
+user_id = get_current_user_id()
+db = get_user_db()
 
 # Custom CSS
 st.markdown("""
@@ -123,9 +119,8 @@ else:
                     # Save profile
                     db.save_user_profile(name, study_goal, hours_per_day, days_per_week, topics)
                     
-                    # Create orchestrator and generate roadmap via Task Planner agent
-                    orchestrator = create_orchestrator_agent()
-                    session_manager = SessionManager()
+                    # Shared session manager; the roadmap call goes to the Task Planner agent
+                    session_manager = get_session_manager()
                     
                     # Generate initial tasks
                     prompt = f"""Generate a personalized learning roadmap for:
@@ -141,29 +136,30 @@ else:
                     Make tasks realistic and achievable given the time available.
                     """
                     
-                    # Call task planner via orchestrator
-                    roadmap = session_manager.run_agent_sync(orchestrator, "user_default", prompt)
+                    # Call the task planner, showing the roadmap as it streams in
+                    st.markdown("### 📋 Your AI-Generated Roadmap")
+                    st.write_stream(session_manager.stream_call("roadmap", user_id, prompt))
                     
                     # Parse and save some initial tasks (simplified for now)
                     # In practice, you'd parse the LLM response to extract structured tasks
-                    db.add_task(
-                        title="Review AI fundamentals",
-                        description="Go through basic concepts",
-                        task_type="daily",
-                        priority=5,
-                        estimated_hours=2
-                    )
-                    db.add_task(
-                        title="Complete one ML tutorial",
-                        description="Follow a hands-on tutorial",
-                        task_type="weekly",
-                        priority=4,
-                        estimated_hours=hours_per_day * 2
-                    )
+                    db.add_tasks_bulk([
+                        {
+                            "title": "Review AI fundamentals",
+                            "description": "Go through basic concepts",
+                            "task_type": "daily",
+                            "priority": 5,
+                            "estimated_hours": 2
+                        },
+                        {
+                            "title": "Complete one ML tutorial",
+                            "description": "Follow a hands-on tutorial",
+                            "task_type": "weekly",
+                            "priority": 4,
+                            "estimated_hours": hours_per_day * 2
+                        }
+                    ])
                     
                     st.success("🎉 Your personalized plan is ready!")
-                    st.markdown("### 📋 Your AI-Generated Roadmap")
-                    st.write(roadmap)
                     
                     # Initialize streak
                     from datetime import datetime
@@ -5,18 +5,19 @@ from datetime import datetime, date
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db_manager import DatabaseManager
-from src.agents.orchestrator import create_orchestrator_agent
-from src.session_manager import SessionManager
+from src.session_manager import get_session_manager
 from src.config import TASK_TYPES, TASK_STATUS
+from src.pagination import KeysetPager
+from src.user_context import get_current_user_id, get_user_db
 
-st.set_page_config(page_title="Daily Tasks", page_icon="📋", layout="wide")
+TASKS_PAGE_SIZE = 10
 
-@st.cache_resource
-def init_resources():
-    return DatabaseManager(), SessionManager(), create_orchestrator_agent()
+st.set_page_config(page_title="Daily Tasks", page_icon="📋", layout="wide")
 
-db, session_manager, orchestrator = init_resources()
+# Shared by app.py and every page; each specialist is built on its first call
+session_manager = get_session_manager()
+user_id = get_current_user_id()
+db = get_user_db()
 
 st.title("📋 Daily Task Manager")
 
@@ -52,18 +53,32 @@ with tab1:
                 else:
                     st.error("Please enter a task title")
     
-    # Display daily tasks
-    daily_tasks = db.get_tasks(task_type="daily")
+    # Display daily tasks, one keyset page per status; the status sweep has
+    # already moved earlier days' unfinished tasks to overdue
+    pending_pager = KeysetPager("daily_pending", TASKS_PAGE_SIZE)
+    pending, pending_has_more = pending_pager.split(
+        db.get_tasks(task_type="daily", status="pending", limit=pending_pager.fetch_limit, after=pending_pager.after)
+    )
+    overdue_pager = KeysetPager("daily_overdue", TASKS_PAGE_SIZE)
+    overdue, overdue_has_more = overdue_pager.split(
+        db.get_tasks(task_type="daily", status="overdue", limit=overdue_pager.fetch_limit, after=overdue_pager.after)
+    )
+    completed_pager = KeysetPager("daily_completed", TASKS_PAGE_SIZE)
+    completed, completed_has_more = completed_pager.split(
+        db.get_tasks(task_type="daily", status="completed", limit=completed_pager.fetch_limit, after=completed_pager.after)
+    )
     
-    if daily_tasks:
-        # Separate by status
-        pending = [t for t in daily_tasks if t['status'] == 'pending']
-        completed = [t for t in daily_tasks if t['status'] == 'completed']
-        
-        # Pending tasks
-        if pending:
-            st.markdown("#### 🔄 Pending")
-            for task in pending:
+    if pending or overdue or completed:
+        # Open tasks: today's first, then overdue ones from earlier days
+        open_sections = [
+            ("#### 🔄 Pending", pending, pending_pager, pending_has_more),
+            ("#### ⏰ Overdue", overdue, overdue_pager, overdue_has_more),
+        ]
+        for heading, tasks, pager, has_more in open_sections:
+            if not tasks:
+                continue
+            st.markdown(heading)
+            for task in tasks:
                 col_a, col_b, col_c = st.columns([3, 1, 1])
                 with col_a:
                     st.markdown(f"**{task['title']}**")
@@ -71,16 +86,12 @@ with tab1:
                         st.caption(task['description'])
                     if task['estimated_hours']:
                         st.caption(f"⏱️ {task['estimated_hours']}h | Priority: {'⭐' * task['priority']}")
+                    if task['status'] == 'overdue' and task['due_date']:
+                        st.caption(f"📅 Was due {task['due_date'][:10]}")
                 with col_b:
                     if st.button("✅ Complete", key=f"complete_{task['id']}"):
-                        db.update_task_status(task['id'], 'completed')
-                        # Add to progress
-                        db.add_progress(
-                            task_id=task['id'],
-                            study_hours=task['estimated_hours'] or 0,
-                            notes=f"Completed: {task['title']}",
-                            date=date.today().isoformat()
-                        )
+                        # Status, progress entry and streak day in one transaction
+                        db.complete_task(task['id'], date=date.today().isoformat())
                         st.success("Task completed!")
                         st.rerun()
                 with col_c:
@@ -88,14 +99,17 @@ with tab1:
                         db.delete_task(task['id'])
                         st.rerun()
                 st.markdown("---")
+            
+            pager.render_controls(has_more, db.cursor_for('tasks', tasks[-1]))
         
         # Completed tasks
         if completed:
-            with st.expander(f"✅ Completed ({len(completed)})"):
+            with st.expander("✅ Completed"):
                 for task in completed:
                     st.markdown(f"~~{task['title']}~~")
                     if task['completed_at']:
                         st.caption(f"Completed: {task['completed_at'][:10]}")
+                completed_pager.render_controls(completed_has_more, db.cursor_for('tasks', completed[-1]))
     else:
         st.info("No daily tasks yet. Add one above!")
     
@@ -111,7 +125,7 @@ Daily Hours Available: {profile['hours_per_day']}
 
 Create practical, actionable tasks that can be completed today."""
                 
-                suggestions = session_manager.run_agent_sync(orchestrator, "user_default", prompt)
+                suggestions = session_manager.run_call("task_suggestions", user_id, prompt)
                 st.markdown("### 💡 AI Suggestions")
                 st.markdown(suggestions)
         else:
@@ -144,7 +158,10 @@ with tab2:
                     st.rerun()
     
     # Display weekly tasks
-    weekly_tasks = db.get_tasks(task_type="weekly")
+    weekly_pager = KeysetPager("weekly_tasks", TASKS_PAGE_SIZE)
+    weekly_tasks, weekly_has_more = weekly_pager.split(
+        db.get_tasks(task_type="weekly", limit=weekly_pager.fetch_limit, after=weekly_pager.after)
+    )
     
     if weekly_tasks:
         for task in weekly_tasks:
@@ -164,6 +181,8 @@ with tab2:
                     db.delete_task(task['id'])
                     st.rerun()
             st.markdown("---")
+        
+        weekly_pager.render_controls(weekly_has_more, db.cursor_for('tasks', weekly_tasks[-1]))
     else:
         st.info("No weekly goals yet")
 
@@ -189,7 +208,10 @@ with tab3:
                     st.rerun()
     
     # Display long-term tasks
-    longterm_tasks = db.get_tasks(task_type="long-term")
+    longterm_pager = KeysetPager("longterm_tasks", TASKS_PAGE_SIZE)
+    longterm_tasks, longterm_has_more = longterm_pager.split(
+        db.get_tasks(task_type="long-term", limit=longterm_pager.fetch_limit, after=longterm_pager.after)
+    )
     
     if longterm_tasks:
         for task in longterm_tasks:
@@ -209,5 +231,7 @@ with tab3:
                     db.delete_task(task['id'])
                     st.rerun()
             st.markdown("---")
+        
+        longterm_pager.render_controls(longterm_has_more, db.cursor_for('tasks', longterm_tasks[-1]))
     else:
         st.info("No long-term objectives yet")
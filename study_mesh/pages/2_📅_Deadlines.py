@@ -6,19 +6,22 @@ import json
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db_manager import DatabaseManager
-from src.agents.orchestrator import create_orchestrator_agent
-from src.session_manager import SessionManager
+from src.session_manager import get_session_manager
 import asyncio
 from src.config import DEADLINE_CATEGORIES
+from database.days import day_number
+from database.db_manager import ACTIVE_DEADLINE_STATUSES
+from src.pagination import KeysetPager
+from src.user_context import get_current_user_id, get_user_db
 
-st.set_page_config(page_title="Deadlines", page_icon="📅", layout="wide")
+DEADLINES_PAGE_SIZE = 10
 
-@st.cache_resource
-def init_resources():
-    return DatabaseManager(), SessionManager(), create_orchestrator_agent()
+st.set_page_config(page_title="Deadlines", page_icon="📅", layout="wide")
 
-db, session_manager, orchestrator = init_resources()
+# Shared by app.py and every page; each specialist is built on its first call
+session_manager = get_session_manager()
+user_id = get_current_user_id()
+db = get_user_db()
 
 # Modern CSS
 st.markdown("""
@@ -80,7 +83,7 @@ if st.button("✨ Extract with AI", type="primary"):
     if url_or_text.strip():
         with st.spinner("🤖 AI is analyzing the content..."):
             try:
-                # Use deadline_parser agent via orchestrator
+                # Routed straight to the deadline_parser agent (call type deadline_parse)
                 parse_prompt = f"""Extract deadline information from this text or URL:
 
 {url_or_text}
@@ -96,8 +99,11 @@ Return a JSON object with:
 If any field cannot be determined, use reasonable defaults or "Not specified".
 """
                 
-                response_output = session_manager.run_agent_sync(orchestrator, "user_default", parse_prompt)
-                result_text = response_output
+                # Show the raw answer as it streams in, then parse it
+                with st.expander("🤖 AI response", expanded=True):
+                    result_text = st.write_stream(
+                        session_manager.stream_call("deadline_parse", user_id, parse_prompt)
+                    )
                 
                 # Try to parse JSON from response
                 try:
@@ -145,7 +151,7 @@ If any field cannot be determined, use reasonable defaults or "Not specified".
                             deadline_date=parsed_data.get('deadline_date', date.today().isoformat()),
                             category=parsed_data.get('category', 'other'),
                             priority=parsed_data.get('priority', 3),
-                            requirements='\n'.join(parsed_data.get('requirements', []))
+                            requirements=parsed_data.get('requirements', [])
                         )
                         st.success(f"✅ Saved: {parsed_data.get('title')}")
                         st.rerun()
@@ -202,15 +208,20 @@ with st.expander("➕ Add Deadline Manually"):
 st.markdown("---")
 st.markdown("### 📋 Active Deadlines")
 
-deadlines = db.get_deadlines(status="pending")
+# One keyset page at a time, already ordered by deadline date
+active_pager = KeysetPager("active_deadlines", DEADLINES_PAGE_SIZE)
+deadlines, has_more = active_pager.split(
+    db.get_deadlines(status=ACTIVE_DEADLINE_STATUSES, limit=active_pager.fetch_limit, after=active_pager.after)
+)
 
 if deadlines:
-    # Sort by deadline date
-    deadlines.sort(key=lambda x: x['deadline_date'])
+    # Checklists for the whole page in one query
+    requirements_by_deadline = db.get_requirements(tuple(deadline['id'] for deadline in deadlines))
     
+    today = day_number(date.today())
     for deadline in deadlines:
         try:
-            days_left = (datetime.fromisoformat(deadline['deadline_date']) - datetime.now()).days
+            days_left = deadline['deadline_day'] - today
             
             # Color code by urgency
             if days_left <= 3:
@@ -237,56 +248,56 @@ if deadlines:
                 if deadline.get('description'):
                     st.markdown(deadline['description'])
                 
-                # Requirements checklist
-                if deadline.get('requirements'):
+                # Requirements checklist; each tick updates a single row
+                requirements = requirements_by_deadline[deadline['id']]
+                if requirements:
                     st.markdown("**Requirements:**")
-                    requirements_list = deadline['requirements'].split('\n')
-                    completed_reqs = deadline.get('completed_requirements', '').split('\n') if deadline.get('completed_requirements') else []
+                    st.progress(
+                        deadline['requirements_done'] / deadline['requirements_total'],
+                        text=f"{deadline['requirements_done']} of {deadline['requirements_total']} done"
+                    )
                     
-                    for req in requirements_list:
-                        if req.strip():
-                            is_done = req.strip() in completed_reqs
-                            checkbox_key = f"req_{deadline['id']}_{req[:20]}"
-                            
-                            if st.checkbox(req.strip(), value=is_done, key=checkbox_key):
-                                if not is_done:
-                                    # Add to completed
-                                    new_completed = completed_reqs + [req.strip()]
-                                    db.update_deadline_status(
-                                        deadline['id'],
-                                        'in_progress',
-                                        '\n'.join(new_completed)
-                                    )
-                                    st.rerun()
-                            else:
-                                if is_done:
-                                    # Remove from completed
-                                    new_completed = [r for r in completed_reqs if r != req.strip()]
-                                    db.update_deadline_status(
-                                        deadline['id'],
-                                        'pending' if not new_completed else 'in_progress',
-                                        '\n'.join(new_completed)
-                                    )
-                                    st.rerun()
+                    for req in requirements:
+                        is_done = bool(req['done'])
+                        if st.checkbox(req['text'], value=is_done, key=f"req_{req['id']}") != is_done:
+                            db.toggle_requirement(req['id'], not is_done)
+                            st.rerun()
             
             with col2:
                 st.markdown(f"**📅 {deadline['deadline_date']}**")
                 st.caption(f"Priority: {'⭐' * deadline['priority']}")
                 
                 if st.button("✅ Complete", key=f"complete_{deadline['id']}"):
-                    db.update_deadline_status(deadline['id'], 'completed', deadline.get('completed_requirements', ''))
+                    db.update_deadline_status(deadline['id'], 'completed')
                     st.success("Deadline marked as completed!")
                     st.rerun()
             
             st.markdown('</div>', unsafe_allow_html=True)
         except Exception as e:
             st.error(f"Error displaying deadline: {e}")
+    
+    active_pager.render_controls(has_more, db.cursor_for('deadlines', deadlines[-1]))
 else:
     st.info("📭 No active deadlines. Use the AI extractor above or add one manually!")
 
 # Completed deadlines
-completed_deadlines = db.get_deadlines(status="completed")
+completed_pager = KeysetPager("completed_deadlines", DEADLINES_PAGE_SIZE)
+completed_deadlines, completed_has_more = completed_pager.split(
+    db.get_deadlines(status="completed", limit=completed_pager.fetch_limit, after=completed_pager.after)
+)
 if completed_deadlines:
-    with st.expander(f"✅ Completed Deadlines ({len(completed_deadlines)})"):
+    with st.expander("✅ Completed Deadlines"):
         for deadline in completed_deadlines:
             st.markdown(f"✓ ~~{deadline['title']}~~ - {deadline['deadline_date']}")
+        completed_pager.render_controls(completed_has_more, db.cursor_for('deadlines', completed_deadlines[-1]))
+
+# Deadlines whose date passed while still open (marked by the status sweep)
+missed_pager = KeysetPager("missed_deadlines", DEADLINES_PAGE_SIZE)
+missed_deadlines, missed_has_more = missed_pager.split(
+    db.get_deadlines(status="missed", limit=missed_pager.fetch_limit, after=missed_pager.after)
+)
+if missed_deadlines:
+    with st.expander("⏰ Missed Deadlines"):
+        for deadline in missed_deadlines:
+            st.markdown(f"✗ {deadline['title']} - {deadline['deadline_date']}")
+        missed_pager.render_controls(missed_has_more, db.cursor_for('deadlines', missed_deadlines[-1]))
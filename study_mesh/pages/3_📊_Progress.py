@@ -7,17 +7,15 @@ import plotly.express as px
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db_manager import DatabaseManager
-from src.agents.orchestrator import create_orchestrator_agent
-from src.session_manager import SessionManager
+from src.user_context import get_current_user_id, get_user_db
+from src.session_manager import get_session_manager
 
 st.set_page_config(page_title="Progress", page_icon="📊", layout="wide")
 
-@st.cache_resource
-def init_resources():
-    return DatabaseManager(), SessionManager(), create_orchestrator_agent()
-
-db, session_manager, orchestrator = init_resources()
+# Shared by app.py and every page; each specialist is built on its first call
+session_manager = get_session_manager()
+user_id = get_current_user_id()
+db = get_user_db()
 
 st.title("📊 Progress Analytics")
 
@@ -28,27 +26,31 @@ with col1:
 with col2:
     end_date = st.date_input("To", value=datetime.now().date())
 
-# Get progress data
-progress_data = db.get_progress(start_date=start_date.isoformat(), end_date=end_date.isoformat())
-tasks = db.get_tasks()
+# Get aggregated progress data from the trigger-maintained progress_daily rollup
+progress_totals = db.progress_totals(start_date=start_date.isoformat(), end_date=end_date.isoformat())
+# All-time task statistics include tasks already moved to the archive tier
+task_counts = db.task_counts_by('task_type', 'status', include_archived=True)
+total_task_count = sum(row['count'] for row in task_counts)
+completed_task_count = sum(row['count'] for row in task_counts if row['status'] == 'completed')
+# Completions inside the selected range, an integer range scan on completed_day
+range_completed_count = db.count_tasks_completed_between(start_date, end_date, include_archived=True)
 
 # Metrics
 col_a, col_b, col_c, col_d = st.columns(4)
 
 with col_a:
-    total_hours = sum([p['study_hours'] for p in progress_data if p['study_hours']])
+    total_hours = progress_totals['total_hours']
     st.metric("Total Study Hours", f"{total_hours:.1f}h")
 
 with col_b:
-    completed_tasks = [t for t in tasks if t['status'] == 'completed']
-    st.metric("Tasks Completed", len(completed_tasks))
+    st.metric("Tasks Completed", range_completed_count)
 
 with col_c:
     avg_hours = total_hours / max(1, (end_date - start_date).days + 1)
     st.metric("Avg Hours/Day", f"{avg_hours:.1f}h")
 
 with col_d:
-    completion_rate = (len(completed_tasks) / max(1, len(tasks))) * 100
+    completion_rate = (completed_task_count / max(1, total_task_count)) * 100
     st.metric("Completion Rate", f"{completion_rate:.0f}%")
 
 st.markdown("---")
@@ -59,18 +61,12 @@ tab1, tab2, tab3 = st.tabs(["Study Hours", "Task Completion", "Weekly Summary"])
 with tab1:
     st.markdown("### 📈 Study Hours Over Time")
     
-    if progress_data:
-        # Aggregate by date
-        hours_by_date = {}
-        for p in progress_data:
-            date = p['date']
-            if date not in hours_by_date:
-                hours_by_date[date] = 0
-            hours_by_date[date] += p['study_hours'] or 0
-        
+    hours_by_date = db.hours_by('day', start_date=start_date.isoformat(), end_date=end_date.isoformat())
+    
+    if hours_by_date:
         df = pd.DataFrame([
-            {"Date": date, "Hours": hours}
-            for date, hours in sorted(hours_by_date.items())
+            {"Date": row['period'], "Hours": row['hours']}
+            for row in hours_by_date
         ])
         
         fig = px.line(df, x="Date", y="Hours", markers=True)
@@ -82,15 +78,18 @@ with tab1:
 with tab2:
     st.markdown("### ✅ Task Completion by Type")
     
-    if tasks:
+    if total_task_count:
         task_stats = {}
         for task_type in ['daily', 'weekly', 'long-term']:
-            type_tasks = [t for t in tasks if t['task_type'] == task_type]
-            completed = [t for t in type_tasks if t['status'] == 'completed']
+            type_total = sum(row['count'] for row in task_counts if row['task_type'] == task_type)
+            type_completed = sum(
+                row['count'] for row in task_counts
+                if row['task_type'] == task_type and row['status'] == 'completed'
+            )
             task_stats[task_type] = {
-                'Total': len(type_tasks),
-                'Completed': len(completed),
-                'Pending': len(type_tasks) - len(completed)
+                'Total': type_total,
+                'Completed': type_completed,
+                'Pending': type_total - type_completed
             }
         
         df = pd.DataFrame(task_stats).T
@@ -103,15 +102,13 @@ with tab3:
     
     # Get this week's data
     week_start = datetime.now().date() - timedelta(days=datetime.now().weekday())
-    week_progress = db.get_progress(start_date=week_start.isoformat())
-    
-    week_hours = sum([p['study_hours'] for p in week_progress if p['study_hours']])
-    week_tasks = [t for t in tasks if t['status'] == 'completed' and t['completed_at'] and t['completed_at'].startswith(week_start.isoformat()[:7])]
+    week_hours = db.progress_totals(start_date=week_start.isoformat())['total_hours']
+    week_completed = db.count_tasks_completed_between(week_start, datetime.now().date())
     
     col1, col2 = st.columns(2)
     with col1:
         st.metric("This Week's Hours", f"{week_hours:.1f}h")
-        st.metric("Tasks Completed", len(week_tasks))
+        st.metric("Tasks Completed", week_completed)
     
     with col2:
         profile = db.get_user_profile()
@@ -127,8 +124,8 @@ st.markdown("---")
 st.markdown("### 📱 Share Your Progress")
 
 if st.button("🤖 Generate Social Media Post"):
-    if completed_tasks:
-        achievement = f"Completed {len(completed_tasks)} tasks and studied {total_hours:.1f} hours in the past {(end_date - start_date).days + 1} days"
+    if range_completed_count:
+        achievement = f"Completed {range_completed_count} tasks and studied {total_hours:.1f} hours in the past {(end_date - start_date).days + 1} days"
         
         platform = st.selectbox("Platform", ["linkedin", "twitter", "medium"])
         
@@ -139,7 +136,7 @@ if st.button("🤖 Generate Social Media Post"):
             Make it engaging, professional (if LinkedIn) or catchy (if Twitter).
             Include relevant hashtags."""
             
-            post = session_manager.run_agent_sync(orchestrator, "user_default", prompt)
+            post = session_manager.run_call("social_post", user_id, prompt)
             
             st.markdown("#### Generated Post:")
             st.text_area("", post, height=200)
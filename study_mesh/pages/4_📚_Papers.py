@@ -5,19 +5,26 @@ import json
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db_manager import DatabaseManager
+from src.user_context import get_current_user_id, get_user_db
 from src.paper_finder import PaperFinder
-from src.agents.orchestrator import create_orchestrator_agent
-from src.session_manager import SessionManager
+from src.session_manager import get_session_manager
+from src.pagination import KeysetPager
 import asyncio
 
 st.set_page_config(page_title="Papers", page_icon="📚", layout="wide")
 
+# Library cards show these columns; abstracts are fetched only when opened
+LIBRARY_COLUMNS = ('id', 'title', 'authors', 'arxiv_id', 'pdf_url', 'published_date', 'summary', 'is_read')
+
 @st.cache_resource
 def init_resources():
-    return DatabaseManager(), PaperFinder(), SessionManager(), create_orchestrator_agent()
+    return PaperFinder()
 
-db, paper_finder, session_manager, orchestrator = init_resources()
+paper_finder = init_resources()
+# Shared by app.py and every page; each specialist is built on its first call
+session_manager = get_session_manager()
+user_id = get_current_user_id()
+db = get_user_db()
 
 # Modern CSS
 st.markdown("""
@@ -88,85 +95,88 @@ with tab1:
     if st.button("📡 Fetch Daily Papers", type="primary"):
         with st.spinner("🤖 AI is curating papers for you..."):
             try:
-                # Use Research Agent via orchestrator
-                papers = paper_finder.get_daily_papers(topic or profile.get('topics', 'AI'), count=num_papers)
-                
-                if papers:
-                    st.success(f"✅ Found {len(papers)} relevant papers!")
-                    
-                    for i, paper in enumerate(papers, 1):
-                        st.markdown(f'<div class="paper-card">', unsafe_allow_html=True)
-                        
-                        # Paper header
-                        st.markdown(f"### 📄 {paper['title']}")
-                        st.caption(f"👥 {paper['authors']} | 📅 {paper['published_date']}")
-                        
-                        # Abstract
-                        with st.expander("📖 Abstract"):
-                            st.write(paper['abstract'])
-                        
-                        # AI Summary generation
-                        col_sum1, col_sum2 = st.columns(2)
-                        
-                        with col_sum1:
-                            if st.button("🤖 Generate AI Summary", key=f"summary_{i}"):
-                                with st.spinner("AI is reading the paper..."):
-                                    try:
-                                        summary_prompt = f"""Provide a concise 2-3 sentence summary of this research paper for a student:
-                                        
+                # Keep the feed in session state so the per-paper buttons survive reruns
+                st.session_state.daily_papers = paper_finder.get_daily_papers(topic or profile.get('topics', 'AI'), count=num_papers)
+            except Exception as e:
+                st.error(f"❌ Error fetching papers: {e}")
+    
+    papers = st.session_state.get("daily_papers")
+    
+    if papers:
+        st.success(f"✅ Found {len(papers)} relevant papers!")
+        
+        if st.button("💾 Save All to Library"):
+            db.save_papers_bulk(papers)
+            st.success(f"✅ Saved {len(papers)} papers!")
+        
+        for i, paper in enumerate(papers, 1):
+            st.markdown(f'<div class="paper-card">', unsafe_allow_html=True)
+            
+            # Paper header
+            st.markdown(f"### 📄 {paper['title']}")
+            st.caption(f"👥 {paper['authors']} | 📅 {paper['published_date']}")
+            
+            # Abstract
+            with st.expander("📖 Abstract"):
+                st.write(paper['abstract'])
+            
+            # AI Summary generation
+            col_sum1, col_sum2 = st.columns(2)
+            
+            with col_sum1:
+                if st.button("🤖 Generate AI Summary", key=f"summary_{i}"):
+                    with st.spinner("AI is reading the paper..."):
+                        try:
+                            summary_prompt = f"""Provide a concise 2-3 sentence summary of this research paper for a student:
+                            
 Title: {paper['title']}
 Abstract: {paper['abstract'][:500]}
 
 Focus on: What problem it solves, the approach, and key findings."""
-                                        
-                                        response_output = session_manager.run_agent_sync(orchestrator, "user_default", summary_prompt)
-                                        summary = response_output
-                                        
-                                        st.markdown("**🎯 AI Summary:**")
-                                        st.info(summary)
-                                        
-                                        # Save paper with summary
-                                        db.save_paper(
-                                            title=paper['title'],
-                                            authors=paper['authors'],
-                                            abstract=paper['abstract'],
-                                            arxiv_id=paper['arxiv_id'],
-                                            pdf_url=paper['pdf_url'],
-                                            published_date=paper['published_date'],
-                                            summary=summary
-                                        )
-                                        st.success("💾 Saved to library with summary!")
-                                    except Exception as e:
-                                        import traceback
-                                        error_details = traceback.format_exc()
-                                        st.error(f"❌ Error generating summary: {str(e)}")
-                                        with st.expander("📋 Technical Details"):
-                                            st.code(error_details)
-                                        st.warning("💡 This might be due to API rate limits. Please try again in a few minutes.")
-                        
-                        with col_sum2:
-                            if st.button("💾 Save to Library", key=f"save_{i}"):
-                                db.save_paper(
-                                    title=paper['title'],
-                                    authors=paper['authors'],
-                                    abstract=paper['abstract'],
-                                    arxiv_id=paper['arxiv_id'],
-                                    pdf_url=paper['pdf_url'],
-                                    published_date=paper['published_date']
-                                )
-                                st.success("✅ Saved!")
-                        
-                        # PDF link
-                        st.link_button("📄 View PDF", paper['pdf_url'], use_container_width=True)
-                        
-                        st.markdown('</div>', unsafe_allow_html=True)
-                        st.markdown("---")
-                
-                else:
-                    st.warning("No papers found. Try a different topic!")
+                            
+                            st.markdown("**🎯 AI Summary:**")
+                            summary = st.write_stream(
+                                session_manager.stream_call("paper_summary", user_id, summary_prompt)
+                            )
+                            
+                            # Save paper with summary
+                            db.save_paper(
+                                title=paper['title'],
+                                authors=paper['authors'],
+                                abstract=paper['abstract'],
+                                arxiv_id=paper['arxiv_id'],
+                                pdf_url=paper['pdf_url'],
+                                published_date=paper['published_date'],
+                                summary=summary
+                            )
+                            st.success("💾 Saved to library with summary!")
+                        except Exception as e:
+                            import traceback
+                            error_details = traceback.format_exc()
+                            st.error(f"❌ Error generating summary: {str(e)}")
+                            with st.expander("📋 Technical Details"):
+                                st.code(error_details)
+                            st.warning("💡 This might be due to API rate limits. Please try again in a few minutes.")
             
-            except Exception as e:
-                st.error(f"❌ Error fetching papers: {e}")
+            with col_sum2:
+                if st.button("💾 Save to Library", key=f"save_{i}"):
+                    db.save_paper(
+                        title=paper['title'],
+                        authors=paper['authors'],
+                        abstract=paper['abstract'],
+                        arxiv_id=paper['arxiv_id'],
+                        pdf_url=paper['pdf_url'],
+                        published_date=paper['published_date']
+                    )
+                    st.success("✅ Saved!")
+            
+            # PDF link
+            st.link_button("📄 View PDF", paper['pdf_url'], use_container_width=True)
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+            st.markdown("---")
+    elif papers is not None:
+        st.warning("No papers found. Try a different topic!")
 
 with tab2:
     st.markdown("### 🔍 Search arXiv")
@@ -215,18 +225,43 @@ with tab2:
 
 with tab3:
     st.markdown("### 📚 My Saved Papers")
-    
+
+    # Full-text search over titles, abstracts, summaries and authors
+    library_query = st.text_input(
+        "Search my library",
+        placeholder="e.g., graph neural networks",
+        key="library_search"
+    )
+    if library_query:
+        matches = db.search(library_query, kinds=('papers',), limit=20)
+        if matches:
+            st.caption(f"🔎 {len(matches)} best matches")
+            for match in matches:
+                st.markdown(f"**📄 {match['title']}**")
+                st.markdown(f"> {match['snippet']}")
+        else:
+            st.warning("No saved papers match your search")
+        st.markdown("---")
+
     # Filter options
     col_filter1, col_filter2 = st.columns(2)
     with col_filter1:
         show_unread = st.checkbox("Show only unread", value=False)
     with col_filter2:
-        limit = st.slider("Number to show", 5, 50, 20)
+        page_size = st.slider("Papers per page", 5, 50, 20)
     
-    saved_papers = db.get_papers(is_read=0 if show_unread else None, limit=limit)
+    # Fetch one keyset page at a time so render cost stays flat as the library grows
+    is_read_filter = 0 if show_unread else None
+    pager = KeysetPager("library", page_size, filters=is_read_filter)
+    saved_papers, has_more = pager.split(
+        db.get_papers(
+            is_read=is_read_filter, limit=pager.fetch_limit, after=pager.after,
+            columns=LIBRARY_COLUMNS, row_format='object'
+        )
+    )
     
     if saved_papers:
-        st.info(f"📊 Total: {len(saved_papers)} papers")
+        st.info(f"📊 Total: {db.count_papers(is_read=is_read_filter)} papers")
         
         for paper in saved_papers:
             is_read = paper.get('is_read', 0) == 1
@@ -244,10 +279,9 @@ with tab3:
                 st.markdown("**🎯 AI Summary:**")
                 st.info(paper['summary'])
             
-            # Abstract (collapsible)
-            if paper.get('abstract'):
-                with st.expander("📖 Full Abstract"):
-                    st.write(paper['abstract'])
+            # Abstract, loaded only when the reader opens it
+            if st.toggle("📖 Full Abstract", key=f"abstract_{paper['id']}"):
+                st.write(db.get_paper_abstract(paper['id']) or "No abstract available")
             
             # Actions
             col1, col2, col3 = st.columns(3)
@@ -270,19 +304,21 @@ with tab3:
                     if st.button("🤖 Summarize", key=f"sum_lib_{paper['id']}"):
                         with st.spinner("Generating summary..."):
                             try:
+                                abstract = db.get_paper_abstract(paper['id']) or ''
                                 summary_prompt = f"""Summarize this paper in 2-3 sentences:
                                 
 Title: {paper['title']}
-Abstract: {paper.get('abstract', 'No abstract available')[:500]}
+Abstract: {(abstract or 'No abstract available')[:500]}
 """
-                                response_output = session_manager.run_agent_sync(orchestrator, "user_default", summary_prompt)
-                                summary = response_output
+                                summary = st.write_stream(
+                                    session_manager.stream_call("paper_summary", user_id, summary_prompt)
+                                )
                                 
                                 # Update paper with summary
                                 db.save_paper(
                                     title=paper['title'],
                                     authors=paper.get('authors', ''),
-                                    abstract=paper.get('abstract', ''),
+                                    abstract=abstract,
                                     arxiv_id=paper.get('arxiv_id', ''),
                                     pdf_url=paper.get('pdf_url', ''),
                                     published_date=paper.get('published_date', ''),
@@ -300,5 +336,7 @@ Abstract: {paper.get('abstract', 'No abstract available')[:500]}
             
             st.markdown('</div>', unsafe_allow_html=True)
             st.markdown("---")
+        
+        pager.render_controls(has_more, db.cursor_for('papers', saved_papers[-1]))
     else:
         st.info("📭 No saved papers yet. Search for papers or use the Daily Feed!")
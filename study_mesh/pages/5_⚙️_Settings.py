@@ -4,18 +4,15 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db_manager import DatabaseManager
-from database.db_manager import DatabaseManager
-from src.agents.orchestrator import create_orchestrator_agent
-from src.session_manager import SessionManager
+from src.user_context import get_current_user_id, get_user_db
+from src.session_manager import get_session_manager
 
 st.set_page_config(page_title="Settings", page_icon="⚙️", layout="wide")
 
-@st.cache_resource
-def init_resources():
-    return DatabaseManager(), SessionManager(), create_orchestrator_agent()
-
-db, session_manager, orchestrator = init_resources()
+# Shared by app.py and every page; each specialist is built on its first call
+session_manager = get_session_manager()
+user_id = get_current_user_id()
+db = get_user_db()
 
 st.title("⚙️ Settings & Profile")
 
@@ -74,9 +71,8 @@ with tab1:
                     
                     Break it down into weeks and specific tasks."""
                     
-                    roadmap = session_manager.run_agent_sync(orchestrator, "user_default", prompt)
                     st.markdown("### 🗺️ Your Personalized Roadmap")
-                    st.markdown(roadmap)
+                    st.write_stream(session_manager.stream_call("roadmap", user_id, prompt))
                 
                 st.rerun()
             else:
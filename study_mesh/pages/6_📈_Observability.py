@@ -1,17 +1,23 @@
 import streamlit as st
 import sys
 import os
+import plotly.express as px
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from database.tracing import METRIC_PREFIX
+from src.config import (
+    DB_SLOW_QUERY_MS, DB_TRACE_QUERIES, LLM_CACHE_ENABLED, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTLS
+)
 from src.observability.logger import Logger
-from src.observability.metrics import MetricsCollector
+from src.observability.metrics import get_default_collector
+from src.response_cache import get_response_cache
 
 st.set_page_config(page_title="Observability", page_icon="📈", layout="wide")
 
 # Initialize
 logger = Logger()
-metrics = MetricsCollector()
+metrics = get_default_collector()  # shared with the DatabaseManager caches
 
 st.title("📈 Observability Dashboard")
 
@@ -20,7 +26,7 @@ This page shows logging, tracing, and metrics for the AI Productivity Planner.
 """)
 
 # Tabs
-tab1, tab2 = st.tabs(["📋 Logs", "📊 Metrics"])
+tab1, tab2, tab3 = st.tabs(["📋 Logs", "📊 Metrics", "🗄️ Database"])
 
 with tab1:
     st.markdown("### Recent Logs")
@@ -106,6 +112,98 @@ with tab2:
                 metrics.track_metric(metric_name, metric_value)
                 st.success(f"Tracked {metric_name} = {metric_value}")
                 st.rerun()
+    
+    st.markdown("---")
+    st.markdown("### 🤖 LLM Response Cache")
+    
+    if not LLM_CACHE_ENABLED:
+        st.info("The response cache is bypassed (LLM_CACHE_ENABLED / LLM_CACHE_BYPASS); every call goes to the model.")
+    else:
+        response_cache = get_response_cache(
+            ttls=LLM_CACHE_TTLS, max_entries=LLM_CACHE_MAX_ENTRIES, metrics=metrics
+        )
+        cache_stats = response_cache.stats()
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+        with col2:
+            st.metric("Hits / Misses", f"{cache_stats['hits']} / {cache_stats['misses']}")
+        with col3:
+            st.metric("Cached Responses", f"{cache_stats['entries']} / {cache_stats['max_entries']}")
+        with col4:
+            st.metric("Evictions", cache_stats["evictions"])
+        
+        if cache_stats["by_call_type"]:
+            st.dataframe(
+                [
+                    {
+                        "Call type": call_type,
+                        "Cached": item["entries"],
+                        "Lifetime hits": item["hits"],
+                        "TTL (h)": LLM_CACHE_TTLS.get(call_type, 0) / 3600,
+                    }
+                    for call_type, item in sorted(cache_stats["by_call_type"].items())
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        if st.button("🗑️ Clear response cache"):
+            removed = response_cache.clear()
+            st.success(f"Removed {removed} cached responses")
+            st.rerun()
+
+with tab3:
+    st.markdown("### Top Queries by Total Time")
+    
+    if not DB_TRACE_QUERIES:
+        st.info("Query tracing is off. Set DB_TRACE_QUERIES=1 in the environment (or .env) and restart to collect it.")
+    
+    top_queries = metrics.top_latencies(METRIC_PREFIX, limit=15)
+    
+    if top_queries:
+        st.dataframe(
+            [
+                {
+                    "Method": name[len(METRIC_PREFIX):],
+                    "Calls": summary["count"],
+                    "Total (ms)": round(summary["total_ms"], 1),
+                    "Avg (ms)": round(summary["average_ms"], 2),
+                    "p95 (ms)": round(summary["p95_ms"], 2),
+                    "Max (ms)": round(summary["max_ms"], 2),
+                    "Rows": summary["rows"],
+                    "Last SQL": summary["sample"] or "(served from cache)",
+                }
+                for name, summary in top_queries
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        # Latency distribution of one DAL method
+        method = st.selectbox("Latency histogram", [name for name, _ in top_queries])
+        buckets = metrics.get_latency_histogram(method)["buckets"]
+        fig = px.bar(
+            x=[f"≤{bound} ms" if bound != "inf" else "slower" for bound in buckets],
+            y=list(buckets.values()),
+            labels={"x": "Latency", "y": "Calls"}
+        )
+        fig.update_layout(height=300)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No database calls traced yet. Use the app and come back.")
+    
+    st.markdown("---")
+    st.markdown(f"### 🐢 Slow Queries (over {DB_SLOW_QUERY_MS} ms)")
+    
+    slow_queries = metrics.get_slow_queries(limit=20)
+    if slow_queries:
+        for entry in slow_queries:
+            with st.expander(f"{entry['method']} - {entry['ms']:.1f} ms, {entry['rows']} rows ({entry['timestamp'][11:19]})"):
+                st.code(";\n".join(entry["statements"]) or "(no SQL captured)", language="sql")
+    else:
+        st.success("No slow queries recorded")
 
 st.markdown("---")
 st.markdown("### 🎯 Capstone Concept: Observability")
@@ -113,7 +211,7 @@ st.info("""
 This page demonstrates **Observability** through:
 - **Logging**: All agent calls, user actions, and errors are logged
 - **Metrics**: Performance and usage metrics are tracked
-- **Tracing**: Agent execution flow is monitored
+- **Tracing**: Agent execution flow and database calls (latency, rows, SQL) are monitored
 
 This helps debug issues, monitor performance, and understand user behavior.
 """)
@@ -0,0 +1,52 @@
+import threading
+
+from .deadline_parser import create_deadline_parser_agent
+from .orchestrator import create_orchestrator_agent
+from .specialists import (
+    create_content_creator_agent,
+    create_progress_analyst_agent,
+    create_research_agent,
+    create_task_planner_agent
+)
+
+ORCHESTRATOR = "productivity_orchestrator"
+
+# Agents that can be run directly, by name. Each entry builds its own tree:
+# an ADK agent has at most one parent, so the specialists inside the
+# orchestrator's workflows are separate instances from the standalone ones.
+AGENT_FACTORIES = {
+    ORCHESTRATOR: create_orchestrator_agent,
+    "task_planner": create_task_planner_agent,
+    "research_agent": create_research_agent,
+    "deadline_parser": create_deadline_parser_agent,
+    "progress_analyst": create_progress_analyst_agent,
+    "content_creator": create_content_creator_agent,
+}
+
+# Fixed-purpose calls (by call type, see LLM_CACHE_TTLS) and the specialist
+# that handles them directly; the orchestrator is only needed for free-form chat
+CALL_TYPE_AGENTS = {
+    "deadline_parse": "deadline_parser",
+    "paper_summary": "research_agent",
+    "roadmap": "task_planner",
+    "task_suggestions": "task_planner",
+    "praise": "content_creator",
+    "social_post": "content_creator",
+}
+
+_agents = {}
+_agents_lock = threading.Lock()
+
+
+def get_agent(name=ORCHESTRATOR):
+    """Process-wide instance of an agent, built on first use and shared by every page."""
+    if name not in AGENT_FACTORIES:
+        raise ValueError(f"Unknown agent {name!r}; choose from {sorted(AGENT_FACTORIES)}")
+    agent = _agents.get(name)
+    if agent is None:
+        with _agents_lock:
+            agent = _agents.get(name)
+            if agent is None:
+                agent = _agents[name] = AGENT_FACTORIES[name]()
+    return agent
+
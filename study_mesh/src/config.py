@@ -42,3 +42,39 @@ DEADLINE_CATEGORIES = [
 
 # Social Media Platforms
 SOCIAL_PLATFORMS = ["linkedin", "twitter", "medium"]
+
+# Database read cache (entries per DatabaseManager; 0 disables it)
+DB_CACHE_SIZE = 256
+
+# Per-call DAL latency histograms and SQL capture for the Observability page;
+# calls slower than DB_SLOW_QUERY_MS go to the slow-query log. Off by default
+# (it wraps every DAL call); set DB_TRACE_QUERIES=1 in the environment to enable.
+DB_TRACE_QUERIES = os.getenv("DB_TRACE_QUERIES", "").lower() in ("1", "true", "yes")
+DB_SLOW_QUERY_MS = 100
+
+# Seconds a synchronous agent call (SessionManager.run_agent_sync) waits before giving up
+AGENT_CALL_TIMEOUT = 120
+
+# LLM response cache: identical agent/prompt pairs are answered from llm_cache.db
+# for the TTL (seconds) of their call type; calls without a call type (free-form
+# chat) are never cached. LLM_CACHE_ENABLED = False (or LLM_CACHE_BYPASS=1 in the
+# environment) sends every call to the model.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_BYPASS", "").lower() not in ("1", "true", "yes")
+LLM_CACHE_MAX_ENTRIES = 5000
+LLM_CACHE_TTLS = {
+    "praise": 6 * 3600,
+    "task_suggestions": 12 * 3600,
+    "social_post": 24 * 3600,
+    "deadline_parse": 24 * 3600,
+    "roadmap": 7 * 24 * 3600,
+    "paper_summary": 30 * 24 * 3600,
+}
+
+# Multi-user: each student gets their own database file; at most this many stay open
+MAX_OPEN_USER_DBS = 32
+
+# With Streamlit login configured, each student's user id comes from their
+# account. Without it everyone is the default user; ALLOW_URL_USER_IDS=1 in
+# the environment trusts ?user=<id> instead, which anyone can edit, so only
+# set it where access to the app itself is already restricted (e.g. locally).
+ALLOW_URL_USER_IDS = os.getenv("ALLOW_URL_USER_IDS", "").lower() in ("1", "true", "yes")
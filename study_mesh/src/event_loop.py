@@ -0,0 +1,93 @@
+import asyncio
+import concurrent.futures
+import queue
+import threading
+
+
+class BackgroundLoop:
+    """A long-lived asyncio event loop running on a daemon thread.
+
+    Synchronous code (Streamlit scripts) hands coroutines to it with
+    `submit` and gets a concurrent.futures.Future back, so agent calls from
+    every browser session share one loop and run concurrently instead of
+    each call setting up (or re-entering) a loop of its own.
+    """
+
+    def __init__(self, name="agent-loop"):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine):
+        """Schedule a coroutine on the loop; returns a concurrent.futures.Future."""
+        if self.loop.is_closed():
+            coroutine.close()
+            raise RuntimeError("Background event loop is closed")
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine, timeout=None):
+        """Block until the coroutine finishes; cancels it and raises TimeoutError after `timeout` seconds."""
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, async_iterable, timeout=None):
+        """Iterate over an async iterable from synchronous code.
+
+        Items are consumed on the loop and handed over through a queue as
+        they arrive. `timeout` bounds the wait for each item (TimeoutError);
+        errors from the iterable are re-raised here, and leaving the loop
+        early cancels it.
+        """
+        items = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for item in async_iterable:
+                    items.put(item)
+            finally:
+                items.put(done)
+
+        future = self.submit(pump())
+        try:
+            while True:
+                try:
+                    item = items.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No result within {timeout} seconds")
+                if item is done:
+                    break
+                yield item
+            future.result(timeout)
+        finally:
+            future.cancel()
+
+    def close(self, timeout=5):
+        """Stop the loop and wait for its thread to exit."""
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+        if not self.thread.is_alive():
+            self.loop.close()
+
+
+_default_loop = None
+_default_loop_lock = threading.Lock()
+
+
+def get_background_loop():
+    """Process-wide BackgroundLoop shared by every SessionManager."""
+    global _default_loop
+    with _default_loop_lock:
+        if _default_loop is None:
+            _default_loop = BackgroundLoop()
+        return _default_loop
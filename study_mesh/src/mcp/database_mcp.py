@@ -1,62 +1,74 @@
-from database.db_manager import DatabaseManager
+from database.days import day_number
+from database.db_manager import ACTIVE_DEADLINE_STATUSES, DatabaseManager
 from datetime import datetime, timedelta
 
 class DatabaseMCP:
     """MCP server for database queries and analytics."""
     
-    def __init__(self):
-        self.db = DatabaseManager()
+    def __init__(self, db=None):
+        # Pass a user's DatabaseManager to query their data; defaults to planner.db
+        self.db = db or DatabaseManager()
     
     def query_progress_summary(self, days=7):
         """Get progress summary for the last N days."""
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=days-1)
         
-        progress = self.db.get_progress(
+        totals = self.db.progress_totals(
             start_date=start_date.isoformat(),
             end_date=end_date.isoformat()
         )
         
-        total_hours = sum([p['study_hours'] for p in progress if p['study_hours']])
+        total_hours = totals['total_hours']
         
         return {
             "period": f"{start_date} to {end_date}",
             "total_hours": total_hours,
             "avg_hours_per_day": total_hours / days,
-            "sessions": len(progress)
+            "sessions": totals['sessions'],
+            "tasks_completed": self.db.count_tasks_completed_between(start_date, end_date)
         }
     
     def query_task_statistics(self):
         """Get task statistics."""
-        all_tasks = self.db.get_tasks()
+        counts = self.db.task_counts_by('task_type', 'status')
+        
+        def count(task_type=None, status=None):
+            return sum(
+                row['count'] for row in counts
+                if (task_type is None or row['task_type'] == task_type)
+                and (status is None or row['status'] == status)
+            )
         
         stats = {
-            "total": len(all_tasks),
-            "completed": len([t for t in all_tasks if t['status'] == 'completed']),
-            "pending": len([t for t in all_tasks if t['status'] == 'pending']),
-            "in_progress": len([t for t in all_tasks if t['status'] == 'in_progress']),
+            "total": count(),
+            "completed": count(status='completed'),
+            "pending": count(status='pending'),
+            "in_progress": count(status='in_progress'),
             "by_type": {}
         }
         
         for task_type in ['daily', 'weekly', 'long-term']:
-            type_tasks = [t for t in all_tasks if t['task_type'] == task_type]
             stats['by_type'][task_type] = {
-                "total": len(type_tasks),
-                "completed": len([t for t in type_tasks if t['status'] == 'completed'])
+                "total": count(task_type=task_type),
+                "completed": count(task_type=task_type, status='completed')
             }
         
         return stats
     
     def query_upcoming_deadlines(self, days=30):
         """Get upcoming deadlines."""
-        deadlines = self.db.get_deadlines(status="pending")
+        today = datetime.now().date()
+        deadlines = self.db.get_deadlines(
+            status=ACTIVE_DEADLINE_STATUSES,
+            due_by=(today + timedelta(days=days)).isoformat()
+        )
         
         upcoming = []
-        today = datetime.now().date()
         
+        today_number = day_number(today)
         for deadline in deadlines:
-            deadline_date = datetime.fromisoformat(deadline['deadline_date']).date()
-            days_left = (deadline_date - today).days
+            days_left = deadline['deadline_day'] - today_number
             
             if 0 <= days_left <= days:
                 upcoming.append({
@@ -69,6 +81,13 @@ class DatabaseMCP:
         
         return sorted(upcoming, key=lambda x: x['days_left'])
     
+    def query_overdue(self):
+        """Get overdue tasks and missed deadlines (as marked by the status sweep)."""
+        return {
+            "overdue_tasks": self.db.get_tasks(status="overdue", columns=('title', 'task_type', 'due_date')),
+            "missed_deadlines": self.db.get_deadlines(status="missed", columns=('title', 'deadline_date', 'category'))
+        }
+    
     def query_github_consistency(self, days=7):
         """Get GitHub consistency metrics."""
         end_date = datetime.now().date()
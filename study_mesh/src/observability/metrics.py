@@ -1,5 +1,13 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict, deque
 from datetime import datetime
-from collections import defaultdict
+
+# Upper bounds (ms) of the latency histogram buckets; slower samples land in a final overflow bucket
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Slow-query log entries kept (oldest dropped first)
+SLOW_QUERY_LOG_SIZE = 200
 
 class MetricsCollector:
     """Collects and tracks metrics for the planner."""
@@ -7,6 +15,10 @@ class MetricsCollector:
     def __init__(self):
         self.metrics = defaultdict(list)
         self.counters = defaultdict(int)
+        # Fixed-size latency histograms and the slow-query log, so memory stays flat however long the app runs
+        self.latencies = {}
+        self.slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+        self.lock = threading.Lock()
     
     def track_metric(self, metric_name, value):
         """Track a metric value."""
@@ -47,3 +59,93 @@ class MetricsCollector:
             summary[f"{counter_name}_count"] = value
         
         return summary
+    
+    def observe_latency(self, name, ms, rows=None, sample=None):
+        """Add one duration (milliseconds) to the latency histogram `name`.
+        
+        `rows` adds to the histogram's row total and `sample` (e.g. the SQL
+        that ran) replaces its latest sample text.
+        """
+        with self.lock:
+            histogram = self.latencies.get(name)
+            if histogram is None:
+                histogram = self.latencies[name] = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "sample": None,
+                    "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1)
+                }
+            histogram["count"] += 1
+            histogram["total_ms"] += ms
+            histogram["max_ms"] = max(histogram["max_ms"], ms)
+            histogram["buckets"][bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+            if rows:
+                histogram["rows"] += rows
+            if sample:
+                histogram["sample"] = sample
+    
+    def get_latency_histogram(self, name):
+        """Count, total, average, max, bucket-estimated p50/p95, rows and sample of a histogram (None if unseen)."""
+        with self.lock:
+            histogram = self.latencies.get(name)
+            if histogram is None:
+                return None
+            histogram = dict(histogram, buckets=list(histogram["buckets"]))
+        
+        count = histogram["count"]
+        return {
+            "count": count,
+            "total_ms": histogram["total_ms"],
+            "average_ms": histogram["total_ms"] / count,
+            "max_ms": histogram["max_ms"],
+            "p50_ms": self._bucket_percentile(histogram, 0.50),
+            "p95_ms": self._bucket_percentile(histogram, 0.95),
+            "rows": histogram["rows"],
+            "sample": histogram["sample"],
+            "buckets": dict(zip(LATENCY_BUCKETS_MS + ("inf",), histogram["buckets"]))
+        }
+    
+    def _bucket_percentile(self, histogram, fraction):
+        """Upper bound of the bucket holding the given fraction of samples (capped at the max seen)."""
+        target = fraction * histogram["count"]
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, histogram["buckets"]):
+            seen += count
+            if seen >= target:
+                return min(bound, histogram["max_ms"])
+        return histogram["max_ms"]
+    
+    def get_latency_histograms(self, prefix=""):
+        """Summaries of every latency histogram whose name starts with `prefix`."""
+        with self.lock:
+            names = [name for name in self.latencies if name.startswith(prefix)]
+        return {name: self.get_latency_histogram(name) for name in names}
+    
+    def top_latencies(self, prefix="", limit=10, by="total_ms"):
+        """The `limit` histograms under `prefix` with the largest `by` value, as (name, summary) pairs."""
+        histograms = self.get_latency_histograms(prefix)
+        return sorted(histograms.items(), key=lambda item: item[1][by], reverse=True)[:limit]
+    
+    def log_slow_query(self, entry):
+        """Append an entry (a dict) to the bounded slow-query log."""
+        with self.lock:
+            self.slow_queries.append(dict(entry, timestamp=datetime.now().isoformat()))
+    
+    def get_slow_queries(self, limit=None):
+        """Slow-query log entries, newest first."""
+        with self.lock:
+            entries = list(reversed(self.slow_queries))
+        return entries[:limit] if limit else entries
+
+
+_default_collector = None
+
+
+def get_default_collector():
+    """Process-wide collector shared by the app components and the Observability page."""
+    global _default_collector
+    if _default_collector is None:
+        _default_collector = MetricsCollector()
+    return _default_collector
@@ -0,0 +1,56 @@
+import streamlit as st
+
+
+class KeysetPager:
+    """Keeps keyset cursors for one paginated list across Streamlit reruns."""
+    
+    def __init__(self, key, page_size, filters=None):
+        self.key = key
+        self.page_size = page_size
+        self.state_key = f"pager_{key}"
+        
+        state = st.session_state.get(self.state_key)
+        # Start over from the first page whenever the filters or page size change
+        if state is None or state["filters"] != (filters, page_size):
+            state = {"filters": (filters, page_size), "cursors": [None]}
+            st.session_state[self.state_key] = state
+        self.state = state
+    
+    @property
+    def after(self):
+        """Cursor for the page currently shown (None for the first page)."""
+        return self.state["cursors"][-1]
+    
+    @property
+    def page_number(self):
+        return len(self.state["cursors"])
+    
+    @property
+    def fetch_limit(self):
+        """Rows to request: one extra row tells us whether a next page exists."""
+        return self.page_size + 1
+    
+    def split(self, rows):
+        """Split fetched rows into the visible page and a has-more flag."""
+        if not rows and self.page_number > 1:
+            # Everything on this page was deleted or completed; go back to the start
+            self.state["cursors"] = [None]
+            st.rerun()
+        return rows[:self.page_size], len(rows) > self.page_size
+    
+    def render_controls(self, has_more, next_cursor):
+        """Previous / Next buttons; Next stores `next_cursor` for the following page."""
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        
+        with col_prev:
+            if st.button("⬅️ Previous", key=f"{self.state_key}_prev", disabled=self.page_number == 1):
+                self.state["cursors"].pop()
+                st.rerun()
+        
+        with col_page:
+            st.caption(f"Page {self.page_number}")
+        
+        with col_next:
+            if st.button("Next ➡️", key=f"{self.state_key}_next", disabled=not has_more):
+                self.state["cursors"].append(next_cursor)
+                st.rerun()
@@ -0,0 +1,160 @@
+import hashlib
+import os
+import threading
+import time
+
+from database.connection_pool import ConnectionPool
+from database.db_manager import DB_PATH
+
+# One cache file for the whole server, next to planner.db. Keys hash the full
+# prompt, so only identical requests (e.g. the same paper's summary) share a response.
+RESPONSE_CACHE_PATH = os.path.join(os.path.dirname(DB_PATH), "llm_cache.db")
+
+DEFAULT_MAX_ENTRIES = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    call_type TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses (last_used_at);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_expires ON llm_responses (expires_at);
+"""
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so re-indented or re-wrapped prompts share a key."""
+    return " ".join(prompt.split())
+
+
+def cache_key(agent_name, prompt):
+    """Cache key of one agent/prompt pair."""
+    return hashlib.sha256(f"{agent_name}\n{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Persistent LLM response cache with a TTL per call type and LRU eviction.
+
+    Lives in its own SQLite file so cached answers survive restarts and are
+    shared by every SessionManager in the process. Expired entries are
+    misses; once more than `max_entries` are stored the least recently used
+    ones are deleted.
+    """
+
+    def __init__(self, path=RESPONSE_CACHE_PATH, ttls=None, max_entries=DEFAULT_MAX_ENTRIES, metrics=None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = path
+        self.ttls = dict(ttls or {})
+        self.max_entries = max_entries
+        self.metrics = metrics
+        self.pool = ConnectionPool(path, max_size=2)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _count(self, counter, amount=1):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+        if self.metrics is not None:
+            for _ in range(amount):
+                self.metrics.increment_counter(f"llm_cache_{counter}")
+
+    def ttl_for(self, call_type):
+        """Seconds a response of `call_type` stays fresh."""
+        if call_type not in self.ttls:
+            raise ValueError(f"No cache TTL configured for call type {call_type!r}")
+        return self.ttls[call_type]
+
+    def get(self, agent_name, prompt):
+        """Cached response for the pair, or None when missing or expired."""
+        key = cache_key(agent_name, prompt)
+        now = time.time()
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT response, expires_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row["expires_at"] <= now:
+                conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute(
+                    "UPDATE llm_responses SET last_used_at = ?, hits = hits + 1 WHERE key = ?", (now, key)
+                )
+
+        self._count("hits" if row is not None else "misses")
+        return row["response"] if row is not None else None
+
+    def put(self, agent_name, prompt, call_type, response):
+        """Store a response, then drop expired and least recently used entries."""
+        now = time.time()
+        with self.pool.connection() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO llm_responses
+                   (key, agent, call_type, response, created_at, expires_at, last_used_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (cache_key(agent_name, prompt), agent_name, call_type, response,
+                 now, now + self.ttl_for(call_type), now)
+            )
+            conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (now,))
+            evicted = conn.execute(
+                """DELETE FROM llm_responses WHERE key IN (
+                       SELECT key FROM llm_responses ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                   )""",
+                (self.max_entries,)
+            ).rowcount
+        if evicted:
+            self._count("evictions", evicted)
+
+    def clear(self, call_type=None):
+        """Delete every cached response (or those of one call type); returns how many."""
+        with self.pool.connection() as conn:
+            if call_type is None:
+                return conn.execute("DELETE FROM llm_responses").rowcount
+            return conn.execute("DELETE FROM llm_responses WHERE call_type = ?", (call_type,)).rowcount
+
+    def stats(self):
+        """Hit rate of this process plus stored entries and lifetime hits per call type."""
+        with self.pool.connection() as conn:
+            by_type = {
+                row["call_type"]: {"entries": row["entries"], "hits": row["hits"]}
+                for row in conn.execute(
+                    "SELECT call_type, COUNT(*) AS entries, SUM(hits) AS hits FROM llm_responses GROUP BY call_type"
+                )
+            }
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": sum(item["entries"] for item in by_type.values()),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "by_call_type": by_type
+            }
+
+    def close(self):
+        self.pool.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache(**kwargs):
+    """Process-wide ResponseCache; `kwargs` apply to the first call only."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(**kwargs)
+        return _default_cache
@@ -1,26 +1,64 @@
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 from google.genai import types
+import asyncio
+import threading
 import uuid
+import weakref
+
+from src.agents.registry import CALL_TYPE_AGENTS, get_agent
+from src.config import AGENT_CALL_TIMEOUT, LLM_CACHE_ENABLED, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTLS
+from src.event_loop import get_background_loop
+from src.observability.metrics import get_default_collector
+from src.response_cache import get_response_cache
+
+
+def _event_text(event):
+    """Text parts of an event's content joined together."""
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text for part in event.content.parts if getattr(part, "text", None))
+
 
 class SessionManager:
     """Manages ADK sessions for user interactions."""
     
-    def __init__(self):
+    def __init__(self, response_cache=None, loop=None):
         self.session_service = InMemorySessionService()
         self.app_name = "productivity_planner"
         self.active_sessions = {}
+        # Agent calls run on one long-lived background loop; sessions and the
+        # per-user locks below are only touched from that loop's thread
+        self.loop = loop or get_background_loop()
+        # A user's lock lives only while a call holds or waits for it, so the
+        # map does not grow by one entry per user who ever chatted
+        self.user_locks = weakref.WeakValueDictionary()
+        # One Runner per agent, reused by every call
+        self.runners = {}
+        # Shared persistent cache of agent responses (None when caching is disabled)
+        if response_cache is None and LLM_CACHE_ENABLED:
+            response_cache = get_response_cache(
+                ttls=LLM_CACHE_TTLS,
+                max_entries=LLM_CACHE_MAX_ENTRIES,
+                metrics=get_default_collector()
+            )
+        self.response_cache = response_cache
     
-    async def create_session(self, user_id):
-        """Create a new session for a user."""
+    async def _new_session(self, user_id):
+        """Create an ADK session for a user; returns its id."""
         session_id = f"session_{uuid.uuid4().hex[:8]}"
         
-        session = await self.session_service.create_session(
+        await self.session_service.create_session(
             app_name=self.app_name,
             user_id=user_id,
             session_id=session_id
         )
-        
+        return session_id
+    
+    async def create_session(self, user_id):
+        """Create a new session for a user."""
+        session_id = await self._new_session(user_id)
         self.active_sessions[user_id] = session_id
         return session_id
     
@@ -30,49 +68,183 @@ class SessionManager:
             return self.active_sessions[user_id]
         return await self.create_session(user_id)
     
-    def create_runner(self, agent, user_id=None):
-        """Create a runner for an agent with session management."""
-        return Runner(
-            agent=agent,
-            app_name=self.app_name,
-            session_service=self.session_service
-        )
+    def create_runner(self, agent):
+        """Runner for an agent with session management, created once per agent and reused."""
+        runner = self.runners.get(agent.name)
+        if runner is None or runner.agent is not agent:
+            runner = self.runners[agent.name] = Runner(
+                agent=agent,
+                app_name=self.app_name,
+                session_service=self.session_service
+            )
+        return runner
+    
+    async def _run_events(self, agent, user_id, message, run_config, one_off=False):
+        """Events of one agent run.
+        
+        Chat continues the user's long-lived session, one call at a time per
+        user. `one_off` runs (fixed-purpose calls) get a fresh session that is
+        deleted afterwards, so they neither see nor grow the chat history and
+        their answer depends on the prompt alone, as the response cache assumes.
+        """
+        if one_off:
+            session_id = await self._new_session(user_id)
+            try:
+                async for event in self._runner_events(agent, user_id, session_id, message, run_config):
+                    yield event
+            finally:
+                await self.session_service.delete_session(
+                    app_name=self.app_name, user_id=user_id, session_id=session_id
+                )
+            return
+        
+        # Different users run concurrently; one user's calls share a session, so take turns
+        async with self.user_locks.setdefault(user_id, asyncio.Lock()):
+            session_id = await self.get_or_create_session(user_id)
+            async for event in self._runner_events(agent, user_id, session_id, message, run_config):
+                yield event
     
-    async def run_agent(self, agent, user_id, message):
-        """Run an agent with session management."""
-        session_id = await self.get_or_create_session(user_id)
-        runner = self.create_runner(agent, user_id)
+    def _runner_events(self, agent, user_id, session_id, message, run_config):
+        """The agent's Runner events for one message on a session."""
+        runner = self.create_runner(agent)
         
         # Create message content
         content = types.Content(parts=[types.Part(text=message)])
         
-        # Run agent and collect response
-        response_text = ""
-        async for event in runner.run_async(
+        return runner.run_async(
             user_id=user_id,
             session_id=session_id,
-            new_message=content
-        ):
-            if event.is_final_response() and event.content:
-                for part in event.content.parts:
-                    if hasattr(part, "text"):
-                        response_text += part.text
+            new_message=content,
+            run_config=run_config
+        )
+    
+    def _cached(self, agent, message, call_type, bypass_cache):
+        """(cache to store the response in or None, cached response or None)."""
+        cache = self.response_cache if call_type else None
+        if cache is None or bypass_cache:
+            return cache, None
+        return cache, cache.get(agent.name, message)
+    
+    async def run_agent(self, agent, user_id, message, call_type=None, bypass_cache=False):
+        """Run an agent with session management.
+        
+        With a `call_type` (a key of LLM_CACHE_TTLS) the call runs on a fresh
+        session and an identical earlier prompt to the same agent is answered
+        from the response cache; `bypass_cache=True` skips the lookup and
+        stores the fresh response. Without one it is chat on the user's
+        long-lived session.
+        """
+        cache, cached = self._cached(agent, message, call_type, bypass_cache)
+        if cached is not None:
+            return cached
+        
+        # Run agent and collect response
+        response_text = ""
+        async for event in self._run_events(agent, user_id, message, RunConfig(), one_off=call_type is not None):
+            if event.is_final_response():
+                response_text += _event_text(event)
         
+        if cache is not None and response_text.strip():
+            cache.put(agent.name, message, call_type, response_text)
         return response_text
     
-    def run_agent_sync(self, agent, user_id, message):
-        """Synchronous wrapper for run_agent that handles event loop properly."""
-        import asyncio
-        try:
-            # Try to get existing event loop
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If loop is already running (e.g., in Streamlit), create new loop
-                import nest_asyncio
-                nest_asyncio.apply()
-                return loop.run_until_complete(self.run_agent(agent, user_id, message))
-            else:
-                return loop.run_until_complete(self.run_agent(agent, user_id, message))
-        except RuntimeError:
-            # No event loop, create new one
-            return asyncio.run(self.run_agent(agent, user_id, message))
+    async def stream_agent(self, agent, user_id, message, call_type=None, bypass_cache=False):
+        """Run an agent, yielding its response text in chunks as the model generates it.
+        
+        Streamed (partial) text is yielded as it arrives and a final response
+        that was not streamed is yielded whole. Caching works as in
+        run_agent; a cache hit is yielded as a single chunk.
+        """
+        cache, cached = self._cached(agent, message, call_type, bypass_cache)
+        if cached is not None:
+            yield cached
+            return
+        
+        response_text = ""
+        streamed = False
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+        async for event in self._run_events(agent, user_id, message, run_config, one_off=call_type is not None):
+            text = _event_text(event)
+            if event.partial:
+                if text:
+                    streamed = True
+                    yield text
+                continue
+            if event.is_final_response():
+                if text and not streamed:
+                    yield text
+                response_text += text
+            # The next model turn streams afresh
+            streamed = False
+        
+        if cache is not None and response_text.strip():
+            cache.put(agent.name, message, call_type, response_text)
+    
+    def submit(self, agent, user_id, message, call_type=None, bypass_cache=False):
+        """Start run_agent on the background loop; returns a concurrent.futures.Future.
+        
+        Submissions from any thread run concurrently. Async code on another
+        loop can `await asyncio.wrap_future(session_manager.submit(...))`.
+        """
+        return self.loop.submit(self.run_agent(agent, user_id, message, call_type, bypass_cache))
+    
+    def run_agent_sync(self, agent, user_id, message, call_type=None, bypass_cache=False, timeout=AGENT_CALL_TIMEOUT):
+        """Run an agent from synchronous code, waiting at most `timeout` seconds.
+        
+        Raises TimeoutError (and cancels the call) when the agent takes longer.
+        """
+        return self.loop.run(self.run_agent(agent, user_id, message, call_type, bypass_cache), timeout)
+    
+    def stream_agent_sync(self, agent, user_id, message, call_type=None, bypass_cache=False, timeout=AGENT_CALL_TIMEOUT):
+        """Iterate over stream_agent's chunks from synchronous code (e.g. st.write_stream).
+        
+        `timeout` bounds the wait for each chunk; stopping early cancels the call.
+        """
+        return self.loop.iterate(self.stream_agent(agent, user_id, message, call_type, bypass_cache), timeout)
+    
+    def agent_for(self, call_type):
+        """Specialist that handles a fixed-purpose call type (built on first use)."""
+        if call_type not in CALL_TYPE_AGENTS:
+            raise ValueError(f"Unknown call type {call_type!r}; choose from {sorted(CALL_TYPE_AGENTS)}")
+        return get_agent(CALL_TYPE_AGENTS[call_type])
+    
+    def run_call(self, call_type, user_id, prompt, bypass_cache=False, timeout=AGENT_CALL_TIMEOUT):
+        """Run a fixed-purpose call on its specialist from synchronous code.
+        
+        Goes straight to the agent in CALL_TYPE_AGENTS, so the orchestrator
+        (and its model round-trip) is only built and used for free-form chat.
+        """
+        return self.run_agent_sync(self.agent_for(call_type), user_id, prompt, call_type, bypass_cache, timeout)
+    
+    async def _call_then(self, agent, user_id, prompt, call_type, bypass_cache, on_result):
+        response = await self.run_agent(agent, user_id, prompt, call_type, bypass_cache)
+        if on_result is not None:
+            await asyncio.get_running_loop().run_in_executor(None, on_result, response)
+        return response
+    
+    def submit_call(self, call_type, user_id, prompt, bypass_cache=False, on_result=None):
+        """Background run_call: returns a concurrent.futures.Future without waiting for the model.
+        
+        `on_result(response)` runs in the loop's thread pool once the response
+        arrives, so blocking work such as a database write never holds up the
+        loop (and every other user's agent calls) while it waits on SQLite.
+        """
+        agent = self.agent_for(call_type)
+        return self.loop.submit(self._call_then(agent, user_id, prompt, call_type, bypass_cache, on_result))
+    
+    def stream_call(self, call_type, user_id, prompt, bypass_cache=False, timeout=AGENT_CALL_TIMEOUT):
+        """Streaming run_call: iterate over the specialist's text chunks (e.g. for st.write_stream)."""
+        return self.stream_agent_sync(self.agent_for(call_type), user_id, prompt, call_type, bypass_cache, timeout)
+
+
+_default_session_manager = None
+_default_session_manager_lock = threading.Lock()
+
+
+def get_session_manager():
+    """Process-wide SessionManager, so app.py and every page share sessions and runners."""
+    global _default_session_manager
+    with _default_session_manager_lock:
+        if _default_session_manager is None:
+            _default_session_manager = SessionManager()
+        return _default_session_manager
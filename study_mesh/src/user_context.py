@@ -0,0 +1,97 @@
+import threading
+from datetime import date
+
+import streamlit as st
+
+from database.user_databases import DEFAULT_USER_ID, UserDatabases, is_valid_user_id, user_id_for_identity
+from src.config import ALLOW_URL_USER_IDS, DB_CACHE_SIZE, DB_SLOW_QUERY_MS, DB_TRACE_QUERIES, MAX_OPEN_USER_DBS
+from src.observability.metrics import get_default_collector
+
+
+@st.cache_resource
+def get_user_databases():
+    """Process-wide router from user ids to their DatabaseManagers."""
+    return UserDatabases(
+        max_open=MAX_OPEN_USER_DBS,
+        cache_size=DB_CACHE_SIZE,
+        metrics=get_default_collector(),
+        trace=DB_TRACE_QUERIES,
+        slow_query_ms=DB_SLOW_QUERY_MS
+    )
+
+
+# Email st.experimental_user reports when the app is not behind a login
+_PLACEHOLDER_EMAIL = "test@example.com"
+
+
+def _signed_in_identity():
+    """Email (or subject) of the signed-in viewer, or None without a login.
+    
+    Uses st.user (Streamlit's OIDC login) where available and falls back to
+    st.experimental_user on older versions.
+    """
+    user = getattr(st, "user", None)
+    if user is None:
+        user = getattr(st, "experimental_user", None)
+    if user is None:
+        return None
+    try:
+        info = user.to_dict() if hasattr(user, "to_dict") else dict(user)
+    except Exception:
+        return None
+    if info.get("is_logged_in") is False:
+        return None
+    identity = info.get("email") or info.get("sub")
+    if not identity or identity == _PLACEHOLDER_EMAIL:
+        return None
+    return identity
+
+
+def get_current_user_id():
+    """User for this browser session.
+    
+    Behind a login the id is derived from the signed-in account, and a
+    ?user= naming anyone else is rejected. Without one every visitor is the
+    default user; ?user=<id> is only honoured when ALLOW_URL_USER_IDS is set,
+    since anyone can type another student's id into the URL.
+    """
+    requested = st.query_params.get("user")
+    identity = _signed_in_identity()
+    if identity is not None:
+        user_id = user_id_for_identity(identity)
+        if requested is not None and requested != user_id:
+            st.error("❌ You can only open your own planner. Remove ?user= from the URL.")
+            st.stop()
+        st.session_state.user_id = user_id
+        return user_id
+    
+    if "user_id" not in st.session_state:
+        if requested is not None and not ALLOW_URL_USER_IDS:
+            st.error("❌ User ids in the URL are disabled. Sign in, or set ALLOW_URL_USER_IDS=1 on a trusted deployment.")
+            st.stop()
+        user_id = requested or DEFAULT_USER_ID
+        if not is_valid_user_id(user_id):
+            st.error("❌ Invalid user id in the URL. Use letters, digits, '.', '_' or '-'.")
+            st.stop()
+        st.session_state.user_id = user_id
+    return st.session_state.user_id
+
+
+def get_user_db():
+    """DatabaseManager for the current user.
+    
+    Once per browser session, archives old rows and starts a background
+    snapshot when they are due. On the first load and again whenever the
+    date changes, marks lapsed tasks overdue and deadlines missed.
+    """
+    db = get_user_databases().get(get_current_user_id())
+    if not st.session_state.get("maintenance_checked"):
+        st.session_state.maintenance_checked = True
+        db.compact_if_due()
+        threading.Thread(target=db.backup_if_due, daemon=True).start()
+    
+    today = date.today()
+    if st.session_state.get("statuses_swept_on") != today:
+        st.session_state.statuses_swept_on = today
+        db.sweep_statuses_if_due(today)
+    return db
@@ -0,0 +1,13 @@
+import random
+from datetime import date
+
+import pytest
+
+from database.consistency import run_trial
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rollups_match_rebuild_after_archiving(tmp_path, seed):
+    rng = random.Random(seed)
+    for trial in range(4):
+        assert run_trial(str(tmp_path / f"trial{trial}.db"), rng, date.today()) == []
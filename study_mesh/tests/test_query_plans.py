@@ -0,0 +1,10 @@
+from database.query_plans import HOT_QUERY_CALLS, explain_hot_queries, find_full_scans
+
+
+def test_hot_queries_use_indexes(tmp_path):
+    assert find_full_scans(str(tmp_path / "query_plans.db")) == []
+
+
+def test_every_hot_call_is_explained(tmp_path):
+    labels = {label for label, _, _, _ in explain_hot_queries(str(tmp_path / "query_plans.db"))}
+    assert len(labels) == len(HOT_QUERY_CALLS)